@@ -1,4 +1,17 @@
+from .aliases import *  # noqa
+from .block_ids import *  # noqa
 from .blocks import *  # noqa
+from .clones import *  # noqa
 from .factories import *  # noqa
+from .files import *  # noqa
+from .generation import *  # noqa
+from .permissions import *  # noqa
+from .renditions import *  # noqa
+from .revisions import *  # noqa
+from .sampling import *  # noqa
+from .tags import *  # noqa
+from .translations import *  # noqa
+from .tree import *  # noqa
+from .validation import *  # noqa
 
 __version__ = "4.4.0"
@@ -0,0 +1,72 @@
+import uuid
+
+from django.db import transaction
+from django.db.models import F
+from wagtail.models import Page
+
+from wagtail_factories.tree import copy_page, get_available_slug, insert_pages
+
+__all__ = [
+    "create_aliases",
+]
+
+
+def create_aliases(pages, parent, recursive=True, batch_size=None):
+    """
+    Create aliases of each of `pages` (and, if `recursive`, their descendants) under
+    `parent`, and return them in tree order.
+
+    Like Page.create_alias, aliases get new translation keys, and are live if their source
+    page is. Slugs already used under `parent` get a numeric suffix, as with
+    find_available_slug. Paths are worked out in memory from the source trees and the last
+    child of `parent`, and aliases are inserted with one bulk query per table (per
+    `batch_size` pages), rather than calling create_alias for each page.
+
+    Aliases are created without child relations or view restrictions.
+    """
+    using = parent._state.db
+    last_child = parent.get_last_child()
+    step = Page._str2int(last_child.path[-Page.steplen :]) if last_child else 0
+    slugs = set(parent.get_children().values_list("slug", flat=True))
+
+    aliases = []
+    roots = 0
+    for page in pages:
+        if recursive:
+            source_pages = list(
+                Page.objects.using(using)
+                .descendant_of(page, inclusive=True)
+                .order_by("path")
+                .specific()
+            )
+        else:
+            source_pages = [page.specific]
+
+        step += 1
+        roots += 1
+        root_path = Page._get_path(parent.path, parent.depth + 1, step)
+        slug = get_available_slug(page.slug, slugs)
+        slugs.add(slug)
+        root_url_path = f"{parent.url_path}{slug}/"
+
+        for source in source_pages:
+            alias = copy_page(source)
+            alias.alias_of_id = source.pk
+            alias.draft_title = source.title
+            alias.has_unpublished_changes = not source.live
+            alias.translation_key = uuid.uuid4()
+            alias.path = root_path + source.path[len(page.path) :]
+            alias.depth = parent.depth + 1 + source.depth - page.depth
+            alias.url_path = root_url_path + source.url_path[len(page.url_path) :]
+            aliases.append(alias)
+        aliases[-len(source_pages)].slug = slug
+        if not recursive:
+            aliases[-1].numchild = 0
+
+    with transaction.atomic(using=using):
+        insert_pages(aliases, using, batch_size)
+        Page.objects.using(using).filter(pk=parent.pk).update(
+            numchild=F("numchild") + roots
+        )
+    parent.refresh_from_db(fields=["numchild"])
+    return aliases
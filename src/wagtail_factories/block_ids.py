@@ -0,0 +1,78 @@
+import contextlib
+import contextvars
+import hashlib
+
+from wagtail import blocks
+
+__all__ = [
+    "BlockIdGenerator",
+    "assign_block_ids",
+    "block_ids",
+]
+
+_active_generator = contextvars.ContextVar("block_id_generator", default=None)
+
+
+class BlockIdGenerator:
+    """
+    Generates UUID formatted block IDs from a hash of `seed` and the path of the block in
+    the generated value (its index in each enclosing stream or list, and its name in each
+    enclosing struct), so that blocks keep their IDs when blocks are added or removed
+    elsewhere in the value, other than before them in the same stream or list.
+    """
+
+    def __init__(self, seed):
+        self.seed = str(seed)
+
+    def __call__(self, path):
+        key = "/".join((self.seed, *map(str, path)))
+        h = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        # Formatting the hex digits directly is cheaper than going through uuid.UUID
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+@contextlib.contextmanager
+def block_ids(seed):
+    """
+    Give stream and list children generated within the context deterministic IDs derived
+    from `seed` and their path, see BlockIdGenerator, rather than Wagtail's random UUIDs.
+    A `seed` of None leaves any enclosing context in effect.
+
+    Values generated by separate factory calls in the same context get the same IDs for
+    blocks at the same paths.
+    """
+    if seed is None:
+        yield
+        return
+    token = _active_generator.set(BlockIdGenerator(seed))
+    try:
+        yield
+    finally:
+        _active_generator.reset(token)
+
+
+def assign_block_ids(value):
+    """
+    Give the stream and list children in the generated block `value` IDs from the active
+    block_ids context, if there is one, and return `value`
+    """
+    generator = _active_generator.get()
+    if generator is not None:
+        _assign_block_ids(generator, value, ())
+    return value
+
+
+def _assign_block_ids(generator, value, path):
+    if isinstance(value, blocks.StreamValue):
+        children = enumerate(value)
+    elif isinstance(value, blocks.list_block.ListValue):
+        children = enumerate(value.bound_blocks)
+    elif isinstance(value, blocks.StructValue):
+        for name, child_value in value.items():
+            _assign_block_ids(generator, child_value, (*path, name))
+        return
+    else:
+        return
+    for i, child in children:
+        child.id = generator((*path, i))
+        _assign_block_ids(generator, child.value, (*path, i))
@@ -5,21 +5,35 @@ from factory.declarations import ParameteredAttribute
 from wagtail import blocks
 from wagtail.documents.blocks import DocumentChooserBlock
 from wagtail.images.blocks import ImageBlock, ImageChooserBlock
+from wagtail.rich_text import RichText
 
+from wagtail_factories.block_ids import assign_block_ids, block_ids
 from wagtail_factories.builder import (
+    LIST_OF_PARAM,
+    InvalidDeclaration,
     ListBlockStepBuilder,
     StreamBlockStepBuilder,
     StructBlockStepBuilder,
 )
 from wagtail_factories.factories import DocumentFactory, ImageFactory, PageFactory
 from wagtail_factories.options import BlockFactoryOptions, StreamBlockFactoryOptions
+from wagtail_factories.sampling import (
+    CorpusText,
+    LogNormalLength,
+    sample_block_specs,
+)
 
 __all__ = [
     "CharBlockFactory",
+    "CorpusCharBlockFactory",
+    "CorpusTextBlockFactory",
+    "CorpusRichTextBlockFactory",
     "IntegerBlockFactory",
     "StreamBlockFactory",
     "StreamFieldFactory",
+    "StreamTemplate",
     "ListBlockFactory",
+    "ListOf",
     "StructBlockFactory",
     "PageChooserBlockFactory",
     "ImageChooserBlockFactory",
@@ -40,8 +54,22 @@ class StreamBlockFactory(factory.Factory):
                 "Ensure {f}.Meta.model is set and {f}.Meta.abstract "
                 "is either not set or False.".format(**{"f": cls.__name__})
             )
-        step = cls._builder_class(cls._meta, params, strategy)
-        return step.build()
+        with block_ids(cls._meta.block_id_seed):
+            step = cls._builder_class(cls._meta, params, strategy)
+            return assign_block_ids(step.build())
+
+    @classmethod
+    def generate_weighted_batch(
+        cls, strategy, size, weights, length, seed=None, **kwargs
+    ):
+        """
+        Generate a batch of StreamValues with randomly chosen blocks. See
+        sample_block_specs for the meaning of `weights`, `length` and `seed`.
+        """
+        return [
+            cls.generate(strategy, blocks=spec, **kwargs)
+            for spec in sample_block_specs(weights, length, size, seed=seed)
+        ]
 
     @classmethod
     def _construct_stream(cls, block_class, *args, **kwargs):
@@ -84,6 +112,8 @@ class StreamFieldFactory(ParameteredAttribute):
     Syntax to generate blocks with default factory values:
         <streamfield>__<index>=<block_name>
 
+    Syntax to declare the whole stream positionally:
+        <streamfield>__blocks=[(<block_name>, {<key>: 'foo'}), <block_name>, ...]
     """
 
     def __init__(self, block_types, **kwargs):
@@ -110,6 +140,137 @@ class StreamFieldFactory(ParameteredAttribute):
         return self.stream_block_factory(**extra)
 
 
+class StreamTemplate:
+    """
+    A StreamValue resolved once from a StreamBlockFactory, which can then be instantiated
+    many times, substituting only the leaves that vary between instances.
+
+    Syntax for substitutions follows the StreamFieldFactory declaration syntax, minus the
+    field name:
+        template.instantiate(**{"0__struct_block__title": "foo"})
+
+    Leaves are substituted whole: a leaf block's `value` parameter, or a chooser block's
+    object (e.g. `0__image_chooser_block__image`), is the same as the block itself, but
+    parameters of a chooser's object's factory can't be substituted.
+
+    Each instance shares the raw data of any subtree that isn't substituted, and only copies
+    the containers along the path to a substituted leaf.
+    """
+
+    chooser_params = {
+        blocks.PageChooserBlock: "page",
+        ImageChooserBlock: "image",
+        DocumentChooserBlock: "document",
+    }
+
+    def __init__(self, stream_block_factory, **kwargs):
+        self.block_def = stream_block_factory._meta.get_block_definition()
+        if self.block_def is None:
+            raise TypeError(
+                "StreamTemplate requires a StreamBlockFactory subclass with Meta.model set"
+            )
+        value = stream_block_factory(**kwargs)
+        self.raw_data = self.block_def.get_prep_value(value)
+
+    def instantiate(self, **overrides):
+        raw_data = self.raw_data
+        for key, value in overrides.items():
+            raw_data = self._substitute(
+                self.block_def, raw_data, key.split("__"), value
+            )
+        # StreamValue mutates its top level list in place, so always give it a fresh one
+        return blocks.StreamValue(self.block_def, list(raw_data), is_lazy=True)
+
+    def instantiate_batch(self, overrides_list):
+        return [self.instantiate(**overrides) for overrides in overrides_list]
+
+    def _substitute(self, block, data, path, value):
+        if not path:
+            return block.get_prep_value(value)
+
+        if isinstance(block, blocks.StreamBlock):
+            index, name, *path = self._split_stream_path(block, data, path)
+            item = dict(data[index])
+            item["value"] = self._substitute(
+                block.child_blocks[name], item["value"], path, value
+            )
+            data = list(data)
+            data[index] = item
+        elif isinstance(block, blocks.ListBlock):
+            index = self._get_index(data, path[0])
+            item = dict(data[index])
+            item["value"] = self._substitute(
+                block.child_block, item["value"], path[1:], value
+            )
+            data = list(data)
+            data[index] = item
+        elif isinstance(block, blocks.StructBlock) and path[0] in block.child_blocks:
+            data = dict(data)
+            data[path[0]] = self._substitute(
+                block.child_blocks[path[0]], data.get(path[0]), path[1:], value
+            )
+        elif path == [self._get_leaf_param(block)]:
+            return block.get_prep_value(value)
+        else:
+            raise InvalidDeclaration(
+                f"Cannot substitute {'__'.join(path)} in {type(block).__name__}"
+            )
+        return data
+
+    def _get_leaf_param(self, block):
+        # The parameter the leaf's BlockFactory takes its value from
+        for chooser_class, param in self.chooser_params.items():
+            if isinstance(block, chooser_class):
+                return param
+        return "value"
+
+    def _split_stream_path(self, block, data, path):
+        index = self._get_index(data, path[0])
+        if len(path) < 2 or data[index]["type"] != path[1]:
+            raise InvalidDeclaration(
+                f"Substitutions for index {index} must name its block type "
+                f"'{data[index]['type']}', got: {'__'.join(path)}"
+            )
+        return (index, *path[1:])
+
+    def _get_index(self, data, key):
+        if not key.isdigit() or int(key) >= len(data):
+            raise InvalidDeclaration(
+                f"Index {key} is not present in the template (length {len(data)})"
+            )
+        return int(key)
+
+
+class ListOf:
+    """
+    Compact declaration of the items of a ListBlockFactory, as an alternative to declaring
+    each item's parameters by index.
+
+    Syntax, for <size> items sharing the same parameters:
+        <list_block>=ListOf(size=<size>, <param>=value, ...)
+
+    Syntax, for one item per dict of parameters (params shared by all items may also be
+    passed as keyword arguments):
+        <list_block>=ListOf(params=[{<param>: value}, ...])
+
+    Indexed declarations (<list_block>__<index>__<param>=value) may be combined with ListOf,
+    and take precedence over it.
+    """
+
+    def __init__(self, size=None, params=None, **common_params):
+        if params is None:
+            if size is None:
+                raise TypeError("ListOf requires either size or params")
+            params = [{}] * size
+        elif size is not None and size != len(params):
+            raise ValueError(f"ListOf got size {size} but {len(params)} sets of params")
+        self.params = params
+        self.common_params = common_params
+
+    def get_params_list(self):
+        return [{**self.common_params, **params} for params in self.params]
+
+
 class ListBlockFactory(factory.SubFactory):
     _builder_class = ListBlockStepBuilder
 
@@ -117,14 +278,23 @@ class ListBlockFactory(factory.SubFactory):
         return self.evaluate(None, None, kwargs)
 
     def evaluate(self, instance, step, extra):
-        result = defaultdict(dict)
+        list_of = extra.pop(LIST_OF_PARAM, None)
+        result = dict(enumerate(list_of.get_params_list())) if list_of else {}
+
+        indexed = defaultdict(dict)
         for key, value in extra.items():
-            if key.isdigit():
-                result[int(key)]["value"] = value
+            prefix, _, label = key.partition("__")
+            if not prefix.isdigit():
+                raise InvalidDeclaration(
+                    "ListBlockFactory declarations must be of the form <index>=value, "
+                    f"<index>__<param>=value or ListOf(...), got: {key}"
+                )
+            if label:
+                indexed[int(prefix)][label] = value
             else:
-                prefix, label = key.split("__", maxsplit=1)
-                if prefix and prefix.isdigit():
-                    result[int(prefix)][label] = value
+                indexed[int(prefix)]["value"] = value
+        for i, params in indexed.items():
+            result[i] = {**result.get(i, {}), **params}
 
         subfactory = self.get_factory()
         force_sequence = step.sequence if self.FORCE_SEQUENCE else None
@@ -145,6 +315,18 @@ class StructBlockFactory(factory.Factory):
         abstract = True
         model = blocks.StructBlock
 
+    @classmethod
+    def _generate(cls, strategy, params):
+        if cls._meta.abstract:
+            raise factory.errors.FactoryError(
+                "Cannot generate instances of abstract factory {f}; "
+                "Ensure {f}.Meta.model is set and {f}.Meta.abstract "
+                "is either not set or False.".format(**{"f": cls.__name__})
+            )
+        with block_ids(cls._meta.block_id_seed):
+            step = cls._builder_class(cls._meta, params, strategy)
+            return assign_block_ids(step.build())
+
     @classmethod
     def _construct_struct_value(cls, block_class, params):
         return block_class._meta_class.value_class(
@@ -170,7 +352,10 @@ class BlockFactory(factory.Factory):
 
     @classmethod
     def _construct_block(cls, block_class, *args, **kwargs):
+        skip_clean = kwargs.pop("skip_clean", cls._meta.skip_clean)
         if kwargs.get("value"):
+            if skip_clean:
+                return kwargs["value"]
             return block_class().clean(kwargs["value"])
         return block_class().get_default()
 
@@ -193,6 +378,32 @@ class IntegerBlockFactory(BlockFactory):
         model = blocks.IntegerBlock
 
 
+class CorpusCharBlockFactory(CharBlockFactory):
+    value = CorpusText(length=LogNormalLength(mu=1.5, sigma=0.5, maximum=12))
+
+    class Meta:
+        skip_clean = True
+
+
+class CorpusTextBlockFactory(BlockFactory):
+    value = CorpusText(length=LogNormalLength(mu=3.5, sigma=0.75))
+
+    class Meta:
+        model = blocks.TextBlock
+        skip_clean = True
+
+
+class CorpusRichTextBlockFactory(BlockFactory):
+    value = factory.LazyAttribute(lambda obj: RichText(f"<p>{obj.text}</p>"))
+
+    class Params:
+        text = CorpusText(length=LogNormalLength(mu=4, sigma=0.75))
+
+    class Meta:
+        model = blocks.RichTextBlock
+        skip_clean = True
+
+
 class ChooserBlockFactory(BlockFactory):
     pass
 
@@ -1,9 +1,16 @@
+import copy
 from itertools import zip_longest
 
 from factory import SubFactory
 from factory.builder import StepBuilder
 from wagtail import blocks
 
+# Context parameter under which a ListOf value is passed to its ListBlockFactory
+LIST_OF_PARAM = "_list_of"
+
+# Parameter under which a StreamBlockFactory accepts a positional spec of its blocks
+STREAM_SPEC_PARAM = "blocks"
+
 
 class StreamFieldFactoryException(Exception):
     pass
@@ -22,6 +29,26 @@ class UnknownChildBlockFactory(StreamFieldFactoryException):
 
 
 class BaseBlockStepBuilder(StepBuilder):
+    def __init__(self, factory_meta, extras, strategy):
+        super().__init__(
+            factory_meta, self.expand_list_of_declarations(extras), strategy
+        )
+
+    def expand_list_of_declarations(self, extras):
+        # Passed as-is, a ListOf value would replace the ListBlockFactory declaration of the
+        # same name. Move it into that declaration's context instead, so ListBlockFactory
+        # receives it alongside any <index>__<param> declarations. Keys renamed by a builder
+        # higher up the tree are passed down as they are
+        from wagtail_factories.blocks import ListOf
+
+        suffix = f"__{LIST_OF_PARAM}"
+        return {
+            f"{k}{suffix}"
+            if isinstance(v, ListOf) and k != LIST_OF_PARAM and not k.endswith(suffix)
+            else k: v
+            for k, v in extras.items()
+        }
+
     def recurse(self, factory_meta, extras):
         """Recurse into a sub-factory call."""
         builder_class = factory_meta.factory._builder_class
@@ -38,17 +65,38 @@ class ListBlockStepBuilder(BaseBlockStepBuilder):
 
 class StreamBlockStepBuilder(BaseBlockStepBuilder):
     def __init__(self, factory_meta, extras, strategy):
+        indexed_block_names, block_params = self.get_spec_declarations(
+            factory_meta, extras.pop(STREAM_SPEC_PARAM, None) or []
+        )
         indexed_block_names, extra_declarations = self.get_block_declarations(
-            factory_meta, extras
+            factory_meta, extras, indexed_block_names
+        )
+        new_factory_class = self.create_factory_class(
+            factory_meta, indexed_block_names, block_params
         )
-        new_factory_class = self.create_factory_class(factory_meta, indexed_block_names)
         super().__init__(new_factory_class._meta, extra_declarations, strategy)
 
-    def get_block_declarations(self, factory_meta, extras):
+    def get_spec_declarations(self, factory_meta, spec):
+        # A positional spec is a sequence of block names or (block_name, params) pairs. As
+        # its indexes are implicit there is nothing to parse or validate beyond block names,
+        # and params are bound straight to the block's declaration rather than being passed
+        # as <index>.<block_name>__<param> extra declarations
+        indexed_block_names = {}
+        block_params = {}
+        for i, item in enumerate(spec):
+            name, params = (item, None) if isinstance(item, str) else item
+            if name not in factory_meta.base_declarations:
+                raise UnknownChildBlockFactory(f"No factory defined for block '{name}'")
+            indexed_block_names[i] = name
+            if params:
+                block_params[i] = params
+        return indexed_block_names, block_params
+
+    def get_block_declarations(self, factory_meta, extras, indexed_block_names=None):
         # Mapping of StreamValue index -> block name. We will use this to create a
         # StreamBlockFactory subclass with one declaration for each pair, named
         # <index>.<block_name>
-        indexed_block_names = {}
+        indexed_block_names = {} if indexed_block_names is None else indexed_block_names
 
         # Extra declarations passed at instantiation, renamed from <index>__<name>__... to
         # <index>.<block_name>__..., to match the declarations on the StreamBlockFactory subclass
@@ -92,7 +140,8 @@ class StreamBlockStepBuilder(BaseBlockStepBuilder):
                 transformed_key = self.reconstruct_key(i, name, params)
                 extra_declarations[transformed_key] = v
 
-        self.validate_block_indexes_sequential(indexed_block_names, factory_meta)
+        if extras:
+            self.validate_block_indexes_sequential(indexed_block_names, factory_meta)
         return indexed_block_names, extra_declarations
 
     def reconstruct_key(self, index, name, params):
@@ -110,11 +159,14 @@ class StreamBlockStepBuilder(BaseBlockStepBuilder):
                     f"Parameters for {factory_meta.factory} missing required index {expected}"
                 )
 
-    def create_factory_class(self, old_factory_meta, indexed_block_names):
+    def create_factory_class(
+        self, old_factory_meta, indexed_block_names, block_params=None
+    ):
         # Create a new StreamBlockFactory subclass, with a declaration for each block the user
         # requested at instantiation. This way we can rely on the factory_boy internals for
         # object generation
         new_class_dict = {"Meta": old_factory_meta.to_meta_class()}
+        block_params = block_params or {}
 
         block_def = old_factory_meta.get_block_definition()
         for i, name in indexed_block_names.items():
@@ -131,6 +183,10 @@ class StreamBlockStepBuilder(BaseBlockStepBuilder):
                     # in the factory tree
                     child_def = child_def.child_block
                 declared_value.get_factory()._meta.block_def = child_def
+            if i in block_params:
+                declared_value = self.bind_block_params(
+                    declared_value, name, block_params[i]
+                )
             new_class_dict[f"{i}.{name}"] = declared_value
 
         from wagtail_factories.blocks import StreamBlockFactory
@@ -138,3 +194,15 @@ class StreamBlockStepBuilder(BaseBlockStepBuilder):
         return type(
             "_GeneratedStreamBlockFactory", (StreamBlockFactory,), new_class_dict
         )
+
+    def bind_block_params(self, declared_value, name, params):
+        # Params from a positional spec become defaults of a copy of the block's SubFactory,
+        # exactly as if they had been passed to the SubFactory in the factory definition
+        if not isinstance(declared_value, SubFactory):
+            raise InvalidDeclaration(
+                f"Block '{name}' is not declared with a SubFactory, so cannot take params "
+                f"(got {params})"
+            )
+        declared_value = copy.copy(declared_value)
+        declared_value._defaults = {**declared_value._defaults, **params}
+        return declared_value
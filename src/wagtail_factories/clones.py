@@ -0,0 +1,73 @@
+import uuid
+
+from django.db import transaction
+from django.db.models import F
+from wagtail.blocks import StreamValue
+from wagtail.fields import StreamField
+from wagtail.models import Page
+
+from wagtail_factories.tree import copy_page, get_available_slug, insert_pages
+
+__all__ = [
+    "create_clones",
+]
+
+
+def create_clones(prototype, parent, count, vary=None, batch_size=None):
+    """
+    Create `count` copies of the saved `prototype` page as the last children of `parent`,
+    and return them.
+
+    `vary` maps field names to functions of the clone's index (starting at 1) giving the
+    field value for each clone, e.g. `{"title": lambda n: f"Page {n}"}`; all other field
+    values are copied from the prototype. Unless given in `vary`, slugs are the
+    prototype's slug with the index appended. Slugs already used under `parent` get a
+    further numeric suffix, as with find_available_slug. Clones get new translation keys.
+
+    StreamField values are serialized once, and each clone gets a lazy StreamValue over
+    the serialized data. Paths are worked out in memory from the last child of `parent`,
+    and clones are inserted with one bulk query per table (per `batch_size` pages).
+    Clones are created without revisions or child relations.
+    """
+    vary = dict(vary or {})
+    vary.setdefault("slug", lambda n: f"{prototype.slug}-{n}")
+
+    stream_data = {
+        field.attname: (
+            field.stream_block,
+            field.stream_block.get_prep_value(getattr(prototype, field.attname)),
+        )
+        for field in prototype._meta.concrete_fields
+        if isinstance(field, StreamField) and field.attname not in vary
+    }
+
+    last_child = parent.get_last_child()
+    step = Page._str2int(last_child.path[-Page.steplen :]) if last_child else 0
+    slugs = set(parent.get_children().values_list("slug", flat=True))
+    clones = []
+    for n in range(1, count + 1):
+        clone = copy_page(prototype)
+        clone.translation_key = uuid.uuid4()
+        for name, (stream_block, raw_data) in stream_data.items():
+            setattr(
+                clone, name, StreamValue(stream_block, list(raw_data), is_lazy=True)
+            )
+        for name, value in vary.items():
+            setattr(clone, name, value(n))
+        clone.slug = get_available_slug(clone.slug, slugs)
+        slugs.add(clone.slug)
+        clone.draft_title = clone.title
+        clone.depth = parent.depth + 1
+        clone.path = Page._get_path(parent.path, clone.depth, step + n)
+        clone.numchild = 0
+        clone.url_path = f"{parent.url_path}{clone.slug}/"
+        clones.append(clone)
+
+    using = parent._state.db
+    with transaction.atomic(using=using):
+        insert_pages(clones, using, batch_size)
+        Page.objects.using(using).filter(pk=parent.pk).update(
+            numchild=F("numchild") + count
+        )
+    parent.refresh_from_db(fields=["numchild"])
+    return clones
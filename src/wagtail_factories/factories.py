@@ -1,16 +1,51 @@
 import logging
+import random
 
 import factory
+from django.contrib.auth.models import Group
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, connections, transaction
+from django.db.models.signals import post_save
 from django.utils.text import slugify
 from factory import errors, utils
 from factory.declarations import ParameteredAttribute
 from factory.django import DjangoModelFactory
+from factory.random import randgen
 from wagtail.documents import get_document_model
 from wagtail.images import get_image_model
-from wagtail.models import Collection, Page, Site
+from wagtail.models import Collection, GroupPagePermission, Page, Site
+from wagtail.utils.file import hash_filelike
+
+from wagtail_factories.aliases import create_aliases
+from wagtail_factories.clones import create_clones
+from wagtail_factories.files import (
+    StreamedFile,
+    deduplicate_file,
+    defer_file,
+    is_streamed_file,
+    store_streamed_file,
+)
+from wagtail_factories.generation import get_generation_context
+from wagtail_factories.options import (
+    BulkModelFactoryOptions,
+    CollectionMemberFactoryOptions,
+    MP_NodeFactoryOptions,
+)
+from wagtail_factories.permissions import (
+    create_collection_permissions,
+    create_page_permissions,
+    get_permissions,
+)
+from wagtail_factories.renditions import Renditions
+from wagtail_factories.revisions import RevisionHistory
+from wagtail_factories.tags import Tags
+from wagtail_factories.translations import translate_tree
+from wagtail_factories.tree import attach_child, create_tree
 
 __all__ = [
     "CollectionFactory",
+    "GroupFactory",
+    "GroupPagePermissionFactory",
     "ImageFactory",
     "PageFactory",
     "SiteFactory",
@@ -40,13 +75,66 @@ class ParentNodeFactory(ParameteredAttribute):
         return step.recurse(subfactory, params, force_sequence=force_sequence)
 
 
-class MP_NodeFactory(DjangoModelFactory):
+class SelfSavingPostGenerationMixin:
+    """
+    Mixin for model factories with post-generation declarations that save their own rows
+    (named in ``_self_saving_postgeneration``), after which the instance doesn't need saving
+    again
+    """
+
+    _self_saving_postgeneration = frozenset()
+
+    @classmethod
+    def _after_postgeneration(cls, instance, create, results=None):
+        results = {
+            name: result
+            for name, result in (results or {}).items()
+            if name not in cls._self_saving_postgeneration
+        }
+        super()._after_postgeneration(instance, create, results)
+
+
+class MP_NodeFactory(SelfSavingPostGenerationMixin, DjangoModelFactory):
+    _options_class = MP_NodeFactoryOptions
+
     parent = ParentNodeFactory()
 
+    @classmethod
+    def create_batch(cls, size, **kwargs):
+        """
+        Create a batch of nodes. With ``Meta.atomic_batch`` set, the batch runs in a single
+        transaction (committed every ``Meta.batch_chunk_size`` nodes, if set) and each node
+        is created in its own savepoint, so a node failing with a database or validation
+        error (such as a duplicate page slug) is logged and left out of the result instead
+        of aborting the rest of the batch.
+        """
+        if not cls._meta.atomic_batch:
+            return super().create_batch(size, **kwargs)
+
+        using = cls._meta.database
+        chunk_size = cls._meta.batch_chunk_size or max(size, 1)
+        instances = []
+        for start in range(0, size, chunk_size):
+            with transaction.atomic(using=using):
+                for _ in range(start, min(start + chunk_size, size)):
+                    try:
+                        with transaction.atomic(using=using):
+                            instances.append(cls.create(**kwargs))
+                    except (DatabaseError, ValidationError):
+                        logger.warning(
+                            "%s.create_batch: skipping node that failed to save",
+                            cls.__name__,
+                            exc_info=True,
+                        )
+        return instances
+
     @classmethod
     def _build(cls, model_class, *args, **kwargs):
-        kwargs.pop("parent")
-        return model_class(**kwargs)
+        parent = kwargs.pop("parent")
+        instance = model_class(**kwargs)
+        if cls._meta.build_tree:
+            attach_child(parent, instance)
+        return instance
 
     @classmethod
     def _create(cls, model_class, *args, **kwargs):
@@ -104,17 +192,225 @@ class CollectionFactory(MP_NodeFactory):
     class Meta:
         model = Collection
 
+    @classmethod
+    def create_tree(
+        cls, parent, branching, permissions=None, batch_size=None, **kwargs
+    ):
+        """
+        Create a tree of collections under `parent` in bulk, building each collection from
+        the factory's declarations, see tree.create_tree. `permissions` maps groups to the
+        permissions to give them on every collection in the tree, see
+        permissions.create_collection_permissions.
+        """
+        collections = create_tree(
+            parent,
+            branching,
+            lambda position: cls.build(parent=None, **kwargs),
+            batch_size=batch_size,
+        )
+        if permissions:
+            create_collection_permissions(
+                permissions, collections, batch_size=batch_size
+            )
+        return collections
+
 
 class PageFactory(MP_NodeFactory):
     title = "Test page"
     slug = factory.LazyAttribute(lambda obj: slugify(obj.title))
+    revisions = RevisionHistory()
+
+    _self_saving_postgeneration = frozenset({"revisions"})
 
     class Meta:
         model = Page
 
+    @classmethod
+    def create_translations(cls, page, locales, **kwargs):
+        """
+        Translate `page` and its descendants into each of `locales` in bulk, see
+        translations.translate_tree
+        """
+        return translate_tree(page, locales, **kwargs)
+
+    @classmethod
+    def create_aliases(cls, pages, parent, **kwargs):
+        """
+        Alias each of `pages` under `parent` in bulk, see aliases.create_aliases
+        """
+        return create_aliases(pages, parent, **kwargs)
+
+    @classmethod
+    def create_clone_batch(cls, size, parent, vary=None, batch_size=None, **kwargs):
+        """
+        Create a batch of pages under `parent` by creating one page from the factory's
+        declarations, then cloning it in bulk, see clones.create_clones
+        """
+        if size < 1:
+            return []
+        prototype = cls.create(parent=parent, **kwargs)
+        return [prototype] + create_clones(
+            prototype, parent, size - 1, vary=vary, batch_size=batch_size
+        )
+
+    @classmethod
+    def _create_instance(cls, model_class, parent, kwargs):
+        context = get_generation_context()
+        if context is not None and not ({"locale", "locale_id"} & kwargs.keys()):
+            locale_id = context.get_locale_id(parent)
+            if locale_id is not None:
+                kwargs["locale_id"] = locale_id
+        return super()._create_instance(model_class, parent, kwargs)
+
+
+class BulkModelFactory(SelfSavingPostGenerationMixin, DjangoModelFactory):
+    _options_class = BulkModelFactoryOptions
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def create_batch(cls, size, **kwargs):
+        """
+        Create a batch of instances. With ``Meta.bulk_create`` set, SubFactory dependencies
+        are created first, with one ``create_batch`` call per declaration, then the
+        instances are built and inserted with ``bulk_create``, and ``post_save`` is sent
+        for each of them.
+
+        Declarations passed to SubFactory dependencies can't refer back to the instance
+        being created, and post-generation declarations run as for ``build``, other than
+        those handled by ``_after_bulk_create``.
+
+        Instances are created one at a time on databases that can't return primary keys
+        from bulk inserts, as there's no field to look them up by.
+        """
+        features = connections[cls._meta.database].features
+        if (
+            not cls._meta.bulk_create
+            or cls._meta.django_get_or_create
+            or not features.can_return_rows_from_bulk_insert
+        ):
+            return super().create_batch(size, **kwargs)
+
+        dependencies = cls._create_dependency_batches(size, kwargs)
+        instances = [
+            cls.build(
+                **kwargs, **{name: batch[i] for name, batch in dependencies.items()}
+            )
+            for i in range(size)
+        ]
+        cls._prepare_bulk_instances(instances)
+
+        model_class = cls._meta.get_model_class()
+        manager = cls._get_manager(model_class)
+        with transaction.atomic(using=cls._meta.database):
+            manager.bulk_create(instances, batch_size=cls._meta.bulk_batch_size)
+            for instance in instances:
+                post_save.send(
+                    sender=model_class,
+                    instance=instance,
+                    created=True,
+                    update_fields=None,
+                    raw=False,
+                    using=cls._meta.database,
+                )
+            cls._after_bulk_create(instances, kwargs)
+        return instances
+
+    @classmethod
+    def _create_dependency_batches(cls, size, kwargs):
+        """
+        Create `size` instances for each SubFactory declaration not overridden in `kwargs`,
+        removing the declaration's parameters from `kwargs`
+        """
+        pre_declarations = cls._meta.pre_declarations
+        dependencies = {}
+        for name, declaration in pre_declarations.declarations.items():
+            if name in kwargs or not isinstance(declaration, factory.SubFactory):
+                continue
+            prefix = f"{name}__"
+            params = {
+                key[len(prefix) :]: kwargs.pop(key)
+                for key in list(kwargs)
+                if key.startswith(prefix)
+            }
+            subfactory = declaration.get_factory()
+            dependencies[name] = subfactory.create_batch(
+                size,
+                **{
+                    **declaration._defaults,
+                    **pre_declarations.contexts[name],
+                    **params,
+                },
+            )
+        return dependencies
+
+    @classmethod
+    def _prepare_bulk_instances(cls, instances):
+        """Extension point for setting fields that save() would, before bulk_create"""
+
+    @classmethod
+    def _after_bulk_create(cls, instances, kwargs):
+        """
+        Extension point for post-generation declarations that create their own rows, which
+        don't run when instances are built for bulk_create: run them for all the inserted
+        instances at once, given the create_batch `kwargs`
+        """
+
+
+def set_file_metadata(instance):
+    """Set file_size and file_hash for an image or document with an unsaved file"""
+    if is_streamed_file(instance.file):
+        # Set as the file is stored, see store_streamed_file
+        return
+    instance.file.open()
+    instance.file_size = instance.file.size
+    instance.file_hash = hash_filelike(instance.file)
+
+
+class CollectionMemberFactory(BulkModelFactory):
+    _options_class = CollectionMemberFactoryOptions
 
-class CollectionMemberFactory(DjangoModelFactory):
     collection = factory.SubFactory(CollectionFactory, parent=None)
+    tags = Tags()
+
+    _self_saving_postgeneration = frozenset({"tags"})
+
+    @classmethod
+    def _after_bulk_create(cls, instances, kwargs):
+        declaration = cls._meta.post_declarations.declarations.get("tags")
+        if isinstance(declaration, Tags):
+            declaration.add_tags(instances, kwargs.get("tags"))
+        super()._after_bulk_create(instances, kwargs)
+
+    @classmethod
+    def _create(cls, model_class, *args, **kwargs):
+        streamed = isinstance(kwargs.get("file"), StreamedFile)
+        stores_files = cls._meta.dedup_files or cls._meta.lazy_files or streamed
+        if cls._meta.django_get_or_create or not stores_files:
+            return super()._create(model_class, *args, **kwargs)
+
+        instance = model_class(*args, **kwargs)
+        cls._store_files([instance])
+        instance.save(force_insert=True, using=cls._meta.database)
+        return instance
+
+    @classmethod
+    def _prepare_bulk_instances(cls, instances):
+        cls._store_files(instances)
+
+    @classmethod
+    def _store_files(cls, instances):
+        """
+        Before the instances are saved: with Meta.lazy_files, defer writing files until
+        they're opened; otherwise store streamed files and, with Meta.dedup_files,
+        deduplicate other files
+        """
+        for instance in instances:
+            if cls._meta.lazy_files and defer_file(instance):
+                continue
+            if not store_streamed_file(instance) and cls._meta.dedup_files:
+                deduplicate_file(instance)
 
 
 class ImageFactory(CollectionMemberFactory):
@@ -123,9 +419,28 @@ class ImageFactory(CollectionMemberFactory):
 
     title = "An image"
     file = factory.django.ImageField()
+    renditions = Renditions()
 
+    _self_saving_postgeneration = (
+        CollectionMemberFactory._self_saving_postgeneration | {"renditions"}
+    )
 
-class SiteFactory(DjangoModelFactory):
+    @classmethod
+    def _after_bulk_create(cls, instances, kwargs):
+        declaration = cls._meta.post_declarations.declarations.get("renditions")
+        if isinstance(declaration, Renditions):
+            declaration.add_renditions(instances, kwargs.get("renditions"))
+        super()._after_bulk_create(instances, kwargs)
+
+    @classmethod
+    def _prepare_bulk_instances(cls, instances):
+        # Dimensions are set by the file field when the image is built
+        for instance in instances:
+            set_file_metadata(instance)
+        super()._prepare_bulk_instances(instances)
+
+
+class SiteFactory(BulkModelFactory):
     hostname = "localhost"
     port = factory.Sequence(lambda n: 81 + n)
     site_name = "Test site"
@@ -142,3 +457,60 @@ class DocumentFactory(CollectionMemberFactory):
 
     title = "A document"
     file = factory.django.FileField()
+
+    @classmethod
+    def _prepare_bulk_instances(cls, instances):
+        for instance in instances:
+            set_file_metadata(instance)
+        super()._prepare_bulk_instances(instances)
+
+
+class GroupFactory(DjangoModelFactory):
+    name = factory.Sequence(lambda n: f"Test group {n}")
+
+    class Meta:
+        model = Group
+
+
+class GroupPagePermissionFactory(BulkModelFactory):
+    group = factory.SubFactory(GroupFactory)
+    page = factory.SubFactory(PageFactory, parent=None)
+    permission = factory.LazyFunction(
+        lambda: get_permissions([f"{Page._meta.app_label}.change_page"])[0]
+    )
+
+    class Meta:
+        model = GroupPagePermission
+
+    @classmethod
+    def create_for_subtree(
+        cls, root, groups, permissions, inclusive=True, batch_size=None
+    ):
+        """
+        Give each of `groups` `permissions` on every page in the subtree under `root`, see
+        permissions.create_page_permissions
+        """
+        pages = (
+            Page.objects.using(root._state.db)
+            .descendant_of(root, inclusive=inclusive)
+            .only("pk")
+        )
+        return create_page_permissions(
+            dict.fromkeys(groups, permissions), pages, batch_size=batch_size
+        )
+
+    @classmethod
+    def create_for_sample(
+        cls, pages, size, groups, permissions, seed=None, batch_size=None
+    ):
+        """
+        Give each of `groups` `permissions` on `size` pages drawn from `pages` (from `seed`,
+        or factory_boy's shared random generator), see permissions.create_page_permissions
+        """
+        rng = randgen if seed is None else random.Random(seed)  # noqa: S311
+        pages = list(pages)
+        return create_page_permissions(
+            dict.fromkeys(groups, permissions),
+            rng.sample(pages, min(size, len(pages))),
+            batch_size=batch_size,
+        )
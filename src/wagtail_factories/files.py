@@ -0,0 +1,266 @@
+import hashlib
+import io
+import random
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from factory.declarations import BaseDeclaration
+from factory.random import randgen
+from wagtail.utils.file import hash_filelike
+
+__all__ = [
+    "LazyFileStorageMixin",
+    "LazyFileSystemStorage",
+    "StreamedFile",
+    "StreamedFileField",
+    "clear_stored_files",
+    "deduplicate_file",
+    "defer_file",
+    "store_streamed_file",
+]
+
+# (model label, content hash) -> name of the stored file
+_stored_files = {}
+
+
+def deduplicate_file(instance, field_name="file"):
+    """
+    Store the unsaved file in `instance`'s `field_name` field, unless a file with the same
+    content has already been stored for the model in this session, in which case point the
+    field at that file instead.
+
+    Files are looked up by a hash of their content, and checked to still exist in
+    storage, since deleting any instance sharing a file deletes it for all of them.
+    """
+    field = instance._meta.get_field(field_name)
+    field_file = getattr(instance, field.attname)
+    if not field_file or field_file._committed:
+        return
+
+    key = (instance._meta.label, hash_filelike(field_file))
+    name = _stored_files.get(key)
+    if name is not None and field.storage.exists(name):
+        # Bypass the field's descriptor, which would reread image dimensions from storage
+        instance.__dict__[field.attname] = name
+    else:
+        field_file.save(field_file.name, field_file.file, save=False)
+        _stored_files[key] = field_file.name
+
+
+def clear_stored_files():
+    """Forget the files stored by deduplicate_file, so new files are stored again"""
+    _stored_files.clear()
+
+
+class StreamedContent(io.RawIOBase):
+    """
+    `size` bytes of `chunk` repeated, generated as they're read. Content read in order from
+    the start is hashed as it's read, see hexdigest.
+    """
+
+    def __init__(self, size, chunk):
+        super().__init__()
+        self.size = size
+        self.chunk = memoryview(chunk)
+        self.position = 0
+        self.hasher = hashlib.sha1()  # noqa: S324 - matches Wagtail's file_hash
+        self.hashed = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self.position = max(offset, 0)
+        return self.position
+
+    def readinto(self, buffer):
+        view = memoryview(buffer).cast("B")
+        n = max(min(len(view), self.size - self.position), 0)
+        written = 0
+        while written < n:
+            start = (self.position + written) % len(self.chunk)
+            part = self.chunk[start : start + n - written]
+            view[written : written + len(part)] = part
+            written += len(part)
+        if self.position == self.hashed:
+            self.hasher.update(view[:n])
+            self.hashed += n
+        self.position += n
+        return n
+
+    def hexdigest(self):
+        """Return the SHA-1 of the content, reading whatever hasn't been hashed yet"""
+        if self.hashed < self.size:
+            position = self.position
+            self.seek(self.hashed)
+            while self.read(len(self.chunk)):
+                pass
+            self.seek(position)
+        return self.hasher.hexdigest()
+
+
+class StreamedFile(File):
+    """
+    A file of StreamedContent, with a random `chunk_size` block generated from `seed`, read
+    (and so written to storage) `chunk_size` bytes at a time
+    """
+
+    def __init__(self, name, size, chunk_size, seed):
+        chunk = random.Random(seed).randbytes(chunk_size)  # noqa: S311
+        super().__init__(StreamedContent(size, chunk), name)
+        self.DEFAULT_CHUNK_SIZE = chunk_size
+        self.recipe = (name, size, chunk_size, seed)
+
+    @property
+    def closed(self):
+        return False
+
+    def open(self, mode=None):
+        self.seek(0)
+        return self
+
+    def close(self):
+        pass
+
+
+class StreamedFileField(BaseDeclaration):
+    """
+    A file of `size` bytes, generated as it's written to storage, so that it's never held in
+    memory, e.g. `DocumentFactory(file=StreamedFileField(size=500 * 2**20))`. The content
+    is a random `chunk_size` block (generated from `seed`, or a seed drawn from factory_boy's
+    shared random generator) repeated.
+
+    Factories for models with file_size and file_hash fields (ImageFactory and
+    DocumentFactory) should store the file with store_streamed_file before saving.
+    """
+
+    def __init__(self, size, chunk_size=2**20, filename="streamed.dat", seed=None):
+        super().__init__(size=size, chunk_size=chunk_size, filename=filename, seed=seed)
+
+    def evaluate(self, instance, step, extra):
+        seed = randgen.getrandbits(64) if extra["seed"] is None else extra["seed"]
+        chunk_size = min(extra["chunk_size"], max(extra["size"], 1))
+        return StreamedFile(extra["filename"], extra["size"], chunk_size, seed)
+
+
+def is_streamed_file(field_file):
+    return not field_file._committed and isinstance(field_file.file, StreamedFile)
+
+
+def store_streamed_file(instance, field_name="file"):
+    """
+    Write a StreamedFile in `instance`'s `field_name` field to storage, setting the
+    instance's file_size and file_hash from the content as it's written. Return whether
+    there was a StreamedFile to store.
+    """
+    field_file = getattr(instance, field_name)
+    if not field_file or not is_streamed_file(field_file):
+        return False
+
+    content = field_file.file
+    field_file.save(content.name, content, save=False)
+    instance.file_size = content.size
+    instance.file_hash = content.file.hexdigest()
+    return True
+
+
+class LazyFileStorageMixin:
+    """
+    Storage mixin for deferring writes of generated files (see defer_file) until the file
+    is first opened, or its path is asked for.
+
+    Deferred StreamedFiles are kept as the few values needed to generate them again, but
+    other deferred files are kept in memory until they're written, so clear_deferred_files
+    should be called when they're no longer needed, e.g. at the end of each test.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # name -> content to write, or a StreamedFile recipe
+        self.deferred_files = {}
+
+    def defer_save(self, name, content, max_length=None):
+        """Reserve a name for `content`, as save() would, without writing it yet"""
+        name = self.get_available_name(name, max_length=max_length)
+        if isinstance(content, StreamedFile):
+            content = content.recipe
+        self.deferred_files[name] = content
+        return name
+
+    def materialize(self, name):
+        content = self.deferred_files.pop(name, None)
+        if isinstance(content, tuple):
+            content = StreamedFile(*content)
+        if content is not None:
+            self._save(name, content)
+
+    def clear_deferred_files(self):
+        """Forget the deferred files, which then no longer exist"""
+        self.deferred_files.clear()
+
+    def _open(self, name, mode="rb"):
+        self.materialize(name)
+        return super()._open(name, mode)
+
+    def path(self, name):
+        self.materialize(name)
+        return super().path(name)
+
+    def exists(self, name):
+        return name in self.deferred_files or super().exists(name)
+
+    def size(self, name):
+        content = self.deferred_files.get(name)
+        if isinstance(content, tuple):
+            _, size, *_ = content
+            return size
+        if content is not None:
+            return content.size
+        return super().size(name)
+
+    def delete(self, name):
+        if self.deferred_files.pop(name, None) is None:
+            super().delete(name)
+
+
+class LazyFileSystemStorage(LazyFileStorageMixin, FileSystemStorage):
+    pass
+
+
+def defer_file(instance, field_name="file"):
+    """
+    Record the unsaved file in `instance`'s `field_name` field with its storage, to be
+    written the first time it's opened, and point the field at the file's name. Also sets
+    the instance's file_size and file_hash, if it has them and they aren't set yet.
+
+    Return whether the file was deferred: files are only deferred if their storage uses
+    LazyFileStorageMixin.
+    """
+    field = instance._meta.get_field(field_name)
+    field_file = getattr(instance, field.attname)
+    if (
+        not field_file
+        or field_file._committed
+        or not isinstance(field_file.storage, LazyFileStorageMixin)
+    ):
+        return False
+
+    content = field_file.file
+    if hasattr(instance, "file_hash") and not instance.file_hash:
+        instance.file_size = content.size
+        instance.file_hash = hash_filelike(content)
+    name = field.generate_filename(instance, field_file.name)
+    name = field_file.storage.defer_save(name, content, max_length=field.max_length)
+    # Bypass the field's descriptor, which would read image dimensions from storage
+    instance.__dict__[field.attname] = name
+    return True
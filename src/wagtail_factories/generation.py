@@ -0,0 +1,123 @@
+import contextvars
+import logging
+import threading
+
+from django.db.models.signals import post_delete, post_save
+from wagtail.models import Locale, Site
+from wagtail.signal_handlers import (
+    post_delete_site_signal_handler,
+    post_save_site_signal_handler,
+)
+
+__all__ = [
+    "GenerationContext",
+    "get_generation_context",
+]
+logger = logging.getLogger(__file__)
+
+_active_context = contextvars.ContextVar("generation_context", default=None)
+
+SITE_SIGNAL_HANDLERS = {
+    post_save: post_save_site_signal_handler,
+    post_delete: post_delete_site_signal_handler,
+}
+
+# Wagtail's site signal handlers are replaced by defer_site_signal while any context is
+# open, in any thread
+_handlers_lock = threading.Lock()
+_open_contexts = 0
+_replaced_signals = []
+
+
+def defer_site_signal(signal, **kwargs):
+    """
+    Count a site save or delete against the active GenerationContext, or if there is none
+    (e.g. in another thread), pass it on to Wagtail's handler
+    """
+    context = get_generation_context()
+    if context is not None:
+        context.invalidations_deferred += 1
+    elif signal in _replaced_signals:
+        SITE_SIGNAL_HANDLERS[signal](signal=signal, **kwargs)
+
+
+def _replace_site_signal_handlers():
+    global _open_contexts
+    with _handlers_lock:
+        if not _open_contexts:
+            for signal, handler in SITE_SIGNAL_HANDLERS.items():
+                if signal.disconnect(handler, sender=Site):
+                    _replaced_signals.append(signal)
+                signal.connect(defer_site_signal, sender=Site)
+        _open_contexts += 1
+
+
+def _restore_site_signal_handlers():
+    global _open_contexts
+    with _handlers_lock:
+        _open_contexts -= 1
+        if not _open_contexts:
+            for signal in SITE_SIGNAL_HANDLERS:
+                signal.disconnect(defer_site_signal, sender=Site)
+            for signal in _replaced_signals:
+                signal.connect(SITE_SIGNAL_HANDLERS[signal], sender=Site)
+            _replaced_signals.clear()
+
+
+class GenerationContext:
+    """
+    Context for generating many pages and sites at once:
+
+    - Pages created with PageFactory take their locale from their parent in memory (or the
+      default locale, looked up once), rather than querying for it on each save.
+    - Saving and deleting sites doesn't clear Wagtail's site root paths cache, so root
+      paths are only computed once for the run (and don't reflect sites created in it).
+      The cache is cleared once on exit instead. Sites saved in other threads, or outside
+      the context, still clear the cache as usual.
+
+    `queries_saved` counts the locale queries avoided, and `invalidations_deferred` the
+    site root path cache clears that were skipped.
+    """
+
+    def __init__(self):
+        self.default_locale = None
+        self.queries_saved = 0
+        self.invalidations_deferred = 0
+
+    def __enter__(self):
+        self.token = _active_context.set(self)
+        _replace_site_signal_handlers()
+        return self
+
+    def __exit__(self, *exc_info):
+        _active_context.reset(self.token)
+        _restore_site_signal_handlers()
+        if self.invalidations_deferred:
+            Site.clear_site_root_paths_cache()
+        logger.info(
+            "GenerationContext: saved %d queries, deferred %d cache invalidations",
+            self.queries_saved,
+            self.invalidations_deferred,
+        )
+
+    def get_locale_id(self, parent):
+        """
+        Return the locale id for a new page under `parent` (None for a root page), as Wagtail
+        would set it on save
+        """
+        if parent is not None:
+            if parent.locale_id is None:
+                return None
+            self.queries_saved += 1
+            return parent.locale_id
+
+        if self.default_locale is None:
+            self.default_locale = Locale.get_default()
+        else:
+            self.queries_saved += 1
+        return self.default_locale.pk
+
+
+def get_generation_context():
+    """Return the active GenerationContext, or None if there is none"""
+    return _active_context.get()
@@ -1,17 +1,24 @@
 from factory import declarations
 from factory.base import FactoryOptions, OptionDefault
+from factory.django import DjangoOptions
 
 
 class BlockFactoryOptions(FactoryOptions):
     def _build_default_options(self):
         options = super()._build_default_options()
         options.append(OptionDefault("block_def", None))
+        # Trust values passed to BlockFactory, rather than passing them through block.clean
+        options.append(OptionDefault("skip_clean", False, inherit=True))
+        # Seed for deterministic block IDs, see block_ids.block_ids
+        options.append(OptionDefault("block_id_seed", None, inherit=True))
         return options
 
     def get_meta_dict(self):
         return {
             "model": self.model,
             "block_def": self.block_def,
+            "skip_clean": self.skip_clean,
+            "block_id_seed": self.block_id_seed,
             "abstract": self.abstract,
             "strategy": self.strategy,
             "inline_args": self.inline_args,
@@ -58,3 +65,44 @@ class StreamBlockFactoryOptions(BlockFactoryOptions):
             return self.block_def
         elif self.model is not None:
             return self.model()
+
+
+class MP_NodeFactoryOptions(DjangoOptions):
+    def _build_default_options(self):
+        options = super()._build_default_options()
+        options.extend(
+            [
+                # Wrap create_batch in a single transaction, with a savepoint per node
+                OptionDefault("atomic_batch", False, inherit=True),
+                # Commit every n nodes within an atomic batch, rather than once at the end
+                OptionDefault("batch_chunk_size", None, inherit=True),
+                # Position built nodes under their parent in memory, see tree.attach_child
+                OptionDefault("build_tree", False, inherit=True),
+            ]
+        )
+        return options
+
+
+class BulkModelFactoryOptions(DjangoOptions):
+    def _build_default_options(self):
+        options = super()._build_default_options()
+        options.extend(
+            [
+                # Insert create_batch instances with a single bulk_create
+                OptionDefault("bulk_create", False, inherit=True),
+                # Passed to bulk_create as batch_size
+                OptionDefault("bulk_batch_size", None, inherit=True),
+            ]
+        )
+        return options
+
+
+class CollectionMemberFactoryOptions(BulkModelFactoryOptions):
+    def _build_default_options(self):
+        options = super()._build_default_options()
+        # Share stored files between instances with identical file content,
+        # see files.deduplicate_file
+        options.append(OptionDefault("dedup_files", False, inherit=True))
+        # Write files when they're first opened, see files.defer_file
+        options.append(OptionDefault("lazy_files", False, inherit=True))
+        return options
@@ -0,0 +1,99 @@
+from django.contrib.auth.models import Permission
+from wagtail.models import GroupCollectionPermission, GroupPagePermission, Page
+
+__all__ = [
+    "create_collection_permissions",
+    "create_page_permissions",
+    "get_permissions",
+]
+
+
+def get_permissions(permissions):
+    """
+    Return the Permission objects for `permissions`, given as Permission objects or as
+    "app_label.codename" strings (as for User.has_perm), looking the strings up with one
+    query
+    """
+    names = {p for p in permissions if isinstance(p, str)}
+    found = {}
+    if names:
+        lookup = Permission.objects.none()
+        for name in names:
+            app_label, codename = name.split(".", 1)
+            lookup |= Permission.objects.filter(
+                content_type__app_label=app_label, codename=codename
+            )
+        found = {
+            f"{p.content_type.app_label}.{p.codename}": p
+            for p in lookup.select_related("content_type")
+        }
+        missing = names - found.keys()
+        if missing:
+            raise Permission.DoesNotExist(
+                f"Unknown permissions: {', '.join(sorted(missing))}"
+            )
+    return [found[p] if isinstance(p, str) else p for p in permissions]
+
+
+def create_collection_permissions(group_permissions, collections, batch_size=None):
+    """
+    Give groups permissions on each of `collections`, with one bulk query (per
+    `batch_size` rows). `group_permissions` maps groups to lists of permissions, see
+    get_permissions, e.g. `{editors: ["wagtailimages.add_image"]}`.
+
+    Permissions groups already have are left alone.
+    """
+    rows = [
+        GroupCollectionPermission(
+            group=group, collection=collection, permission=permission
+        )
+        for group, permission in resolve_group_permissions(group_permissions)
+        for collection in collections
+    ]
+    return GroupCollectionPermission.objects.bulk_create(
+        rows, batch_size=batch_size, ignore_conflicts=True
+    )
+
+
+def create_page_permissions(group_permissions, pages, batch_size=None):
+    """
+    Give groups permissions on each of `pages`, with one bulk query (per `batch_size`
+    rows). `group_permissions` maps groups to lists of permissions, see get_permissions;
+    codenames without an app label are page permissions, e.g.
+    `{editors: ["add_page", "change_page"]}`.
+
+    Permissions groups already have are left alone.
+    """
+    app_label = Page._meta.app_label
+    rows = [
+        GroupPagePermission(group=group, page=page, permission=permission)
+        for group, permission in resolve_group_permissions(
+            {
+                group: [
+                    f"{app_label}.{p}" if isinstance(p, str) and "." not in p else p
+                    for p in permissions
+                ]
+                for group, permissions in group_permissions.items()
+            }
+        )
+        for page in pages
+    ]
+    return GroupPagePermission.objects.bulk_create(
+        rows, batch_size=batch_size, ignore_conflicts=True
+    )
+
+
+def resolve_group_permissions(group_permissions):
+    """
+    Return (group, Permission) pairs for `group_permissions`, looking up the permissions
+    for all groups at once
+    """
+    all_permissions = list(
+        dict.fromkeys(p for ps in group_permissions.values() for p in ps)
+    )
+    resolved = dict(zip(all_permissions, get_permissions(all_permissions)))
+    return [
+        (group, resolved[permission])
+        for group, permissions in group_permissions.items()
+        for permission in permissions
+    ]
@@ -0,0 +1,94 @@
+import factory
+from django.core.files.base import ContentFile
+from factory.declarations import PostGenerationDeclaration
+from wagtail.images.models import Filter
+
+__all__ = [
+    "Renditions",
+    "create_batch_renditions",
+    "create_renditions",
+]
+
+# A transparent 1x1 GIF
+PLACEHOLDER_GIF = (
+    b"GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00\x00"
+    b"\x00\x00,\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;"
+)
+PLACEHOLDER_NAME = "images/wagtail_factories_placeholder.gif"
+
+
+def get_placeholder_name(rendition_model):
+    """Save the placeholder file to the rendition storage, if needed, and return its name"""
+    storage = rendition_model._meta.get_field("file").storage
+    if not storage.exists(PLACEHOLDER_NAME):
+        return storage.save(PLACEHOLDER_NAME, ContentFile(PLACEHOLDER_GIF))
+    return PLACEHOLDER_NAME
+
+
+def create_renditions(image, filter_specs):
+    """
+    Create renditions of `image` for each of `filter_specs`, without processing the image:
+    each rendition gets the size the filter would produce, but shares a placeholder file.
+    Renditions that already exist are left alone.
+
+    As the placeholder file is shared, deleting any rendition deletes it for all of them,
+    until it's next needed here.
+    """
+    return create_batch_renditions([image], filter_specs)
+
+
+def create_batch_renditions(images, filter_specs):
+    """
+    Create renditions of each of `images` for each of `filter_specs` with one bulk query,
+    see create_renditions
+    """
+    if not images:
+        return []
+    Rendition = images[0].get_rendition_model()
+    placeholder = get_placeholder_name(Rendition)
+    filters = [Filter(spec=spec) for spec in filter_specs]
+    renditions = []
+    for image in images:
+        for filter in filters:
+            width, height = filter.get_transform(image).size
+            renditions.append(
+                Rendition(
+                    image=image,
+                    filter_spec=filter.spec,
+                    focal_point_key=filter.get_cache_key(image),
+                    file=placeholder,
+                    width=width,
+                    height=height,
+                )
+            )
+    return Rendition.objects.bulk_create(renditions, ignore_conflicts=True)
+
+
+class Renditions(PostGenerationDeclaration):
+    """
+    Create renditions of an image with create_renditions, for the call-time list of filter
+    specs (or `filter_specs`), e.g. `ImageFactory(renditions=["fill-800x600"])`.
+
+    Nothing is created when building images.
+    """
+
+    def __init__(self, filter_specs=()):
+        super().__init__()
+        self.filter_specs = filter_specs
+
+    def add_renditions(self, images, filter_specs=None):
+        """
+        Create renditions of saved `images` for `filter_specs` (or the declaration's
+        `filter_specs`) with one bulk query
+        """
+        filter_specs = self.filter_specs if filter_specs is None else filter_specs
+        if not filter_specs:
+            return []
+        return create_batch_renditions(images, filter_specs)
+
+    def call(self, instance, step, context):
+        if step.builder.strategy != factory.CREATE_STRATEGY:
+            return []
+        return self.add_renditions(
+            [instance], context.value if context.value_provided else None
+        )
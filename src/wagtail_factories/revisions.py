@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+import factory
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections, transaction
+from django.utils import timezone
+from factory.declarations import PostGenerationDeclaration
+from wagtail.models import PageLogEntry, Revision
+
+__all__ = [
+    "RevisionHistory",
+    "create_revisions",
+]
+
+
+def create_revisions(
+    page, count, publish=False, user=None, interval=timedelta(hours=1)
+):
+    """
+    Create `count` revisions of the saved `page`, `interval` apart and ending now, and make
+    the last one the page's latest revision. With `publish`, each revision is logged as
+    published in turn, and the last one is made the page's live revision.
+
+    The page is serialized once for all revisions, and revisions and log entries are
+    inserted with bulk_create, rather than calling save_revision() and publish() for each.
+    """
+    if count < 1:
+        return []
+
+    content = page.serializable_data()
+    object_str = str(page)
+    content_type = ContentType.objects.get_for_model(page, for_concrete_model=False)
+    now = timezone.now()
+    revisions = [
+        Revision(
+            content_type=content_type,
+            base_content_type=page.get_base_content_type(),
+            object_id=str(page.pk),
+            created_at=now - interval * (count - 1 - i),
+            user=user,
+            object_str=object_str,
+            content=content,
+        )
+        for i in range(count)
+    ]
+
+    using = page._state.db
+    with transaction.atomic(using=using):
+        Revision.objects.using(using).bulk_create(revisions)
+        if not connections[using].features.can_return_rows_from_bulk_insert:
+            revisions = list(
+                Revision.objects.using(using)
+                .filter(content_type=content_type, object_id=str(page.pk))
+                .order_by("-created_at", "-pk")[:count]
+            )[::-1]
+
+        latest = revisions[-1]
+        page.latest_revision = latest
+        page.latest_revision_created_at = latest.created_at
+        page.draft_title = page.title
+        update_fields = [
+            "latest_revision",
+            "latest_revision_created_at",
+            "draft_title",
+            "has_unpublished_changes",
+        ]
+
+        if publish:
+            PageLogEntry.objects.using(using).bulk_create(
+                PageLogEntry(
+                    page=page,
+                    content_type=content_type,
+                    label=object_str,
+                    action="wagtail.publish",
+                    timestamp=revision.created_at,
+                    revision=revision,
+                    user=user,
+                    content_changed=True,
+                )
+                for revision in revisions
+            )
+            page.live = True
+            page.live_revision = latest
+            page.has_unpublished_changes = False
+            page.first_published_at = page.first_published_at or revisions[0].created_at
+            page.last_published_at = latest.created_at
+            update_fields += [
+                "live",
+                "live_revision",
+                "first_published_at",
+                "last_published_at",
+            ]
+        else:
+            page.has_unpublished_changes = True
+
+        page.save(update_fields=update_fields, clean=False)
+    return revisions
+
+
+class RevisionHistory(PostGenerationDeclaration):
+    """
+    Create a history of revisions for a page with create_revisions, taking the number of
+    revisions from the call-time value (or `count`), e.g. `PageFactory(revisions=10)`.
+    `publish`, `user` and `interval` may also be passed at call time, e.g.
+    `PageFactory(revisions=10, revisions__publish=True)`.
+
+    Nothing is created when building pages.
+    """
+
+    def __init__(self, count=0, publish=False, interval=timedelta(hours=1)):
+        super().__init__()
+        self.count = count
+        self.publish = publish
+        self.interval = interval
+
+    def call(self, instance, step, context):
+        count = context.value if context.value_provided else self.count
+        if not count or step.builder.strategy != factory.CREATE_STRATEGY:
+            return []
+
+        return create_revisions(
+            instance,
+            count,
+            publish=context.extra.get("publish", self.publish),
+            user=context.extra.get("user"),
+            interval=context.extra.get("interval", self.interval),
+        )
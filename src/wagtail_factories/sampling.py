@@ -0,0 +1,256 @@
+import functools
+import random
+from itertools import accumulate
+
+import factory
+import faker
+from factory.declarations import BaseDeclaration
+from factory.random import randgen
+
+__all__ = [
+    "BufferedFaker",
+    "CorpusText",
+    "LogNormalLength",
+    "ZipfLength",
+    "sample_block_specs",
+]
+
+
+class ZipfLength:
+    """
+    Stream lengths drawn from a Zipf distribution with exponent `a`, truncated to
+    1..`maximum`.
+    """
+
+    def __init__(self, a=2.0, maximum=100):
+        self.lengths = range(1, maximum + 1)
+        self.cum_weights = list(accumulate(k**-a for k in self.lengths))
+
+    def sample(self, rng, size):
+        return rng.choices(self.lengths, cum_weights=self.cum_weights, k=size)
+
+
+class LogNormalLength:
+    """
+    Stream lengths drawn from a lognormal distribution, rounded and clamped to
+    `minimum`..`maximum`.
+    """
+
+    def __init__(self, mu=2.0, sigma=0.5, minimum=1, maximum=None):
+        self.mu = mu
+        self.sigma = sigma
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def sample(self, rng, size):
+        lengths = (
+            max(round(rng.lognormvariate(self.mu, self.sigma)), self.minimum)
+            for _ in range(size)
+        )
+        if self.maximum is None:
+            return list(lengths)
+        return [min(length, self.maximum) for length in lengths]
+
+
+def sample_block_specs(weights, length, size, seed=None):
+    """
+    Sample `size` positional stream specs (see StreamBlockFactory's `blocks` parameter),
+    with block names drawn according to `weights`, a dict mapping block name -> weight.
+
+    `length` is either a fixed stream length, or a distribution such as ZipfLength.
+    Block names for all streams are drawn at once, then split into streams. With no
+    `seed`, draws come from factory_boy's shared random generator.
+    """
+    rng = randgen if seed is None else random.Random(seed)  # noqa: S311
+    lengths = [length] * size if isinstance(length, int) else length.sample(rng, size)
+    names = rng.choices(list(weights), weights=list(weights.values()), k=sum(lengths))
+
+    specs = []
+    start = 0
+    for stream_length in lengths:
+        specs.append(names[start : start + stream_length])
+        start += stream_length
+    return specs
+
+
+LOREM_IPSUM = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua ut enim ad minim veniam quis nostrud "
+    "exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat duis aute irure "
+    "dolor in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur "
+    "excepteur sint occaecat cupidatat non proident sunt in culpa qui officia deserunt "
+    "mollit anim id est laborum"
+)
+
+
+# Incremented whenever factory_boy's random state is set, as factory.random.reseed_random
+# does, so that generators seeded from the shared state can tell when to reseed without
+# comparing states
+_random_epoch = 0
+
+
+def _count_random_state_changes(set_random_state):
+    @functools.wraps(set_random_state)
+    def wrapper(state):
+        global _random_epoch
+        _random_epoch += 1
+        return set_random_state(state)
+
+    wrapper.counts_random_state_changes = True
+    return wrapper
+
+
+if not getattr(factory.random.set_random_state, "counts_random_state_changes", False):
+    factory.random.set_random_state = _count_random_state_changes(
+        factory.random.set_random_state
+    )
+
+
+class SharedSeed:
+    """
+    Seeds for a private random generator, drawn from the `shared` generator on first use
+    and again after each factory.random.reseed_random (or set_random_state). Values
+    generated from the private generator are then reproducible with reseed_random, at the
+    cost of one draw from the shared generator per reseed.
+    """
+
+    def __init__(self, shared):
+        self.shared = shared
+        self.epoch = None
+
+    def next_seed(self):
+        """Return a new seed if the shared generator was reseeded, or else None"""
+        if self.epoch == _random_epoch:
+            return None
+        self.epoch = _random_epoch
+        return self.shared.getrandbits(64)
+
+    def reset(self):
+        self.epoch = None
+
+
+class CorpusText(BaseDeclaration):
+    """
+    Text of `length` words (a fixed count, or a distribution such as LogNormalLength)
+    sampled from `corpus`, a string or sequence of words.
+
+    Words and lengths are drawn in batches (doubling in size up to `buffer_size`), and
+    handed out from a buffer on each evaluation. With a `seed`, draws come from a
+    generator seeded with it. Otherwise they come from a generator seeded from factory_boy's
+    shared random generator (see SharedSeed), which is reseeded, dropping the buffers,
+    after factory.random.reseed_random, so text is reproducible with it.
+    """
+
+    def __init__(self, length=10, corpus=LOREM_IPSUM, seed=None, buffer_size=4096):
+        super().__init__()
+        self.length = length
+        self.words = tuple(corpus.split() if isinstance(corpus, str) else corpus)
+        self.rng = random.Random(seed)  # noqa: S311
+        self.shared_seed = SharedSeed(randgen) if seed is None else None
+        self.buffer_size = buffer_size
+        self.reset_buffers()
+
+    def reset_buffers(self):
+        self.word_buffer = []
+        self.word_position = 0
+        self.length_buffer = []
+        self.fill_size = 1 if self.shared_seed else self.buffer_size
+
+    def next_fill_size(self):
+        fill_size = self.fill_size
+        self.fill_size = min(fill_size * 2, self.buffer_size)
+        return fill_size
+
+    def next_length(self):
+        if isinstance(self.length, int):
+            return self.length
+        if not self.length_buffer:
+            # Pop from the end, so reverse to hand out lengths in the order they were drawn
+            self.length_buffer = self.length.sample(self.rng, self.next_fill_size())[
+                ::-1
+            ]
+        return self.length_buffer.pop()
+
+    def next_words(self, n):
+        start = self.word_position
+        if len(self.word_buffer) - start < n:
+            remaining = self.word_buffer[start:]
+            self.word_buffer = remaining + self.rng.choices(
+                self.words, k=max(self.next_fill_size(), n - len(remaining))
+            )
+            start = 0
+        self.word_position = start + n
+        return self.word_buffer[start : start + n]
+
+    def generate(self):
+        if self.shared_seed and (seed := self.shared_seed.next_seed()) is not None:
+            self.rng.seed(seed)
+            self.reset_buffers()
+        text = " ".join(self.next_words(self.next_length()))
+        return f"{text[:1].upper()}{text[1:]}." if text else text
+
+    def evaluate(self, instance, step, extra):
+        return self.generate()
+
+
+class BufferedFaker(factory.Faker):
+    """
+    Like factory.Faker, but draws values from the provider in batches (doubling in size up
+    to `buffer_size`) and hands them out from a buffer, avoiding Faker's per-call provider
+    lookup.
+
+    With a `seed`, values are drawn from a separate Faker instance seeded with it.
+    Otherwise the separate instance is seeded from Faker's shared random generator (see
+    SharedSeed), and reseeded, dropping the buffers, after factory.random.reseed_random,
+    so values are reproducible with it. Values differ from those factory.Faker would give
+    for the same seed.
+    """
+
+    def __init__(self, provider, buffer_size=4096, seed=None, **kwargs):
+        super().__init__(provider, **kwargs)
+        self.buffer_size = buffer_size
+        self.seed = seed
+        self.shared_seed = SharedSeed(faker.generator.random) if seed is None else None
+        self.fakers = {}
+        self.reset()
+
+    def get_faker(self, locale):
+        if locale not in self.fakers:
+            subfaker = faker.Faker(locale=locale or self._DEFAULT_LOCALE)
+            subfaker.seed_instance(self.seed)
+            self.fakers[locale] = subfaker
+        return self.fakers[locale]
+
+    def reset(self):
+        """Drop the buffers, so values are drawn afresh from the seed"""
+        if self.shared_seed:
+            self.shared_seed.reset()
+        else:
+            self.reseed(self.seed)
+
+    def reseed(self, seed):
+        self.seed = seed
+        for subfaker in self.fakers.values():
+            subfaker.seed_instance(seed)
+        self.buffers = {}
+        self.fill_size = 1 if self.shared_seed else self.buffer_size
+
+    def evaluate(self, instance, step, extra):
+        if self.shared_seed and (seed := self.shared_seed.next_seed()) is not None:
+            self.reseed(seed)
+
+        locale = extra.pop("locale")
+        try:
+            key = (locale, frozenset(extra.items())) if extra else locale
+            buffer = self.buffers.setdefault(key, [])
+        except TypeError:
+            # Unhashable provider arguments, so nothing to key a buffer on
+            return getattr(self.get_faker(locale), self.provider)(**extra)
+
+        if not buffer:
+            provider = getattr(self.get_faker(locale), self.provider)
+            buffer.extend(provider(**extra) for _ in range(self.fill_size))
+            self.fill_size = min(self.fill_size * 2, self.buffer_size)
+            # Pop from the end, so reverse to hand out values in the order they were drawn
+            buffer.reverse()
+        return buffer.pop()
@@ -0,0 +1,133 @@
+import random
+from collections import Counter
+
+import factory
+from factory.declarations import PostGenerationDeclaration
+from factory.random import randgen
+
+__all__ = [
+    "Tags",
+    "create_tagged_items",
+    "get_tags",
+]
+
+
+def get_tags(tag_model, names, using=None):
+    """
+    Return a dict mapping each of `names` to its tag, creating the missing tags with one
+    bulk query. Like Tag.save, slugs already taken (e.g. by "Nature" for "nature") get a
+    numeric suffix.
+    """
+    names = set(names)
+    manager = tag_model._default_manager.db_manager(using)
+    tags = {tag.name: tag for tag in manager.filter(name__in=names)}
+    missing = sorted(names - tags.keys())
+    if missing:
+        # bulk_create skips Tag.save, which sets the slug
+        slugify = tag_model().slugify
+        slugs = {name: slugify(name) for name in missing}
+        used_slugs = set(
+            manager.filter(slug__in=slugs.values()).values_list("slug", flat=True)
+        )
+        # Suffixed slugs are only needed for slugs taken or shared by the missing names
+        counts = Counter(slugs.values())
+        colliding = {
+            slug for slug, count in counts.items() if count > 1 or slug in used_slugs
+        }
+        for slug in colliding:
+            used_slugs.update(
+                manager.filter(slug__startswith=slug).values_list("slug", flat=True)
+            )
+
+        new_tags = []
+        for name in missing:
+            slug = slugs[name]
+            i = 1
+            while slug in used_slugs:
+                slug = slugify(name, i)
+                i += 1
+            used_slugs.add(slug)
+            new_tags.append(tag_model(name=name, slug=slug))
+        manager.bulk_create(new_tags, ignore_conflicts=True)
+        tags.update((tag.name, tag) for tag in manager.filter(name__in=missing))
+    return tags
+
+
+def create_tagged_items(instances, tag_names, field_name="tags"):
+    """
+    Tag each of `instances` with the corresponding list of names in `tag_names`, through
+    their `field_name` TaggableManager. Missing tags are created once, and the through
+    model rows are inserted with one bulk query. Tags the instances already have are left
+    alone.
+    """
+    if not instances:
+        return []
+    using = instances[0]._state.db
+    manager = getattr(instances[0], field_name)
+    through = manager.through
+    tags = get_tags(
+        through.tag_model(), {name for names in tag_names for name in names}, using
+    )
+    items = [
+        through(tag=tags[name], **through.lookup_kwargs(instance))
+        for instance, names in zip(instances, tag_names)
+        for name in dict.fromkeys(names)
+    ]
+    return through._default_manager.db_manager(using).bulk_create(
+        items, ignore_conflicts=True
+    )
+
+
+class Tags(PostGenerationDeclaration):
+    """
+    Tag instances with tags drawn from `vocabulary`, e.g.
+    `tags = Tags(["nature", "city", "people"], count=ZipfLength(maximum=3))`, or with the
+    call-time list of tag names, e.g. `ImageFactory(tags=["nature"])`.
+
+    `count` is either a fixed number of tags per instance, or a distribution such as
+    ZipfLength. Tag names are drawn without replacement, from `seed` or factory_boy's
+    shared random generator. Tags are added with create_tagged_items.
+
+    Nothing is created when building instances.
+    """
+
+    def __init__(self, vocabulary=(), count=1, seed=None):
+        super().__init__()
+        self.vocabulary = list(vocabulary)
+        self.count = count
+        self.rng = randgen if seed is None else random.Random(seed)  # noqa: S311
+
+    def sample(self, size):
+        """Return `size` lists of tag names drawn from the vocabulary"""
+        if not self.vocabulary:
+            return [[] for _ in range(size)]
+        if isinstance(self.count, int):
+            counts = [self.count] * size
+        else:
+            counts = self.count.sample(self.rng, size)
+        return [
+            self.rng.sample(self.vocabulary, min(count, len(self.vocabulary)))
+            for count in counts
+        ]
+
+    def add_tags(self, instances, names=None):
+        """
+        Tag saved `instances` with `names`, or with names drawn for each of them. Without
+        names or a vocabulary, the instances aren't touched, so needn't have tags.
+        """
+        if names is None:
+            if not self.vocabulary:
+                return []
+            tag_names = self.sample(len(instances))
+        elif not names:
+            return []
+        else:
+            tag_names = [names] * len(instances)
+        return create_tagged_items(instances, tag_names)
+
+    def call(self, instance, step, context):
+        if step.builder.strategy != factory.CREATE_STRATEGY:
+            return []
+        return self.add_tags(
+            [instance], context.value if context.value_provided else None
+        )
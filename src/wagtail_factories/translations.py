@@ -0,0 +1,101 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+from wagtail.models import Locale, Page
+
+from wagtail_factories.tree import copy_page, get_available_slug, insert_pages
+
+__all__ = [
+    "translate_tree",
+]
+
+
+def get_locale(locale):
+    if isinstance(locale, Locale):
+        return locale
+    return Locale.objects.get_or_create(language_code=locale)[0]
+
+
+def translate_tree(page, locales, keep_live=True, batch_size=None):
+    """
+    Create translations of `page` and its descendants for each of `locales` (Locale
+    instances or language codes), sharing the source pages' translation keys, and return
+    a dict mapping each language code to its translated pages, in tree order.
+
+    Like Page.copy_for_translation, each translated tree is created under the translation
+    of `page`'s parent, or alongside `page` with the language code appended to its slug
+    if its parent is the root page. Slugs already used under the parent, including by
+    translations created in the same call, get a numeric suffix. Paths and url paths are worked out up front from the
+    source tree, and pages are inserted with one bulk query per table (per `batch_size`
+    pages), rather than copying and saving each page in turn.
+
+    Translations are created without revisions or child relations. With `keep_live`
+    False, they are created as drafts, as copy_for_translation does.
+    """
+    using = page._state.db
+    source_pages = list(
+        Page.objects.using(using)
+        .descendant_of(page, inclusive=True)
+        .order_by("path")
+        .specific()
+    )
+    source_parent = page.get_parent()
+    next_steps = {}
+    used_slugs = {}
+    translations = {}
+    targets = []
+
+    for locale in map(get_locale, locales):
+        if source_parent.is_root():
+            parent = source_parent
+            slug = f"{page.slug}-{locale.language_code}"
+        else:
+            parent = source_parent.get_translation(locale)
+            slug = page.slug
+
+        if parent.pk not in next_steps:
+            last_child = parent.get_last_child()
+            next_steps[parent.pk] = (
+                Page._str2int(last_child.path[-Page.steplen :]) + 1 if last_child else 1
+            )
+            used_slugs[parent.pk] = set(
+                parent.get_children().values_list("slug", flat=True)
+            )
+        slug = get_available_slug(slug, used_slugs[parent.pk])
+        used_slugs[parent.pk].add(slug)
+        step = next_steps[parent.pk]
+        next_steps[parent.pk] += 1
+        root_path = Page._get_path(parent.path, parent.depth + 1, step)
+        root_url_path = f"{parent.url_path}{slug}/"
+
+        translated_pages = []
+        for source in source_pages:
+            translated = copy_page(source)
+            translated.locale = locale
+            translated.path = root_path + source.path[len(page.path) :]
+            translated.depth = parent.depth + 1 + source.depth - page.depth
+            translated.url_path = root_url_path + source.url_path[len(page.url_path) :]
+            if not keep_live:
+                translated.live = False
+                translated.has_unpublished_changes = True
+            translated_pages.append(translated)
+        translated_pages[0].slug = slug
+
+        translations[locale.language_code] = translated_pages
+        targets.append((parent, translated_pages))
+
+    with transaction.atomic(using=using):
+        insert_pages(
+            [p for pages in translations.values() for p in pages], using, batch_size
+        )
+        children = defaultdict(int)
+        for parent, _ in targets:
+            children[parent.pk] += 1
+        for parent_pk, count in children.items():
+            Page.objects.using(using).filter(pk=parent_pk).update(
+                numchild=F("numchild") + count
+            )
+    for parent, _ in targets:
+        parent.refresh_from_db(fields=["numchild"])
+    return translations
@@ -0,0 +1,165 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+from wagtail.models import Page
+
+__all__ = [
+    "attach_child",
+    "create_tree",
+    "get_built_children",
+]
+
+
+def attach_child(parent, node):
+    """
+    Position the unsaved `node` in the tree as the last child of `parent` (or as a root
+    node, if `parent` is None) without querying the database: assign its treebeard path
+    and depth (and url_path, for pages), and link it to `parent` in memory.
+
+    The next free path under `parent` follows its children attached so far, and its
+    saved children if `parent` is saved. The `numchild` of an unsaved `parent` is set to
+    its number of attached children, while that of a saved `parent` is left alone, so it
+    still matches the database. Trees built this way are independent of each other and of
+    the database, so every root node gets the first root path.
+    """
+    if parent is None:
+        node.depth = 1
+        node.path = node._get_path(None, 1, 1)
+    else:
+        children = parent.__dict__.setdefault("_built_children", [])
+        children.append(node)
+        if parent.pk is None:
+            parent.numchild = len(children)
+            step = len(children)
+        else:
+            step = parent.numchild + len(children)
+        node.depth = parent.depth + 1
+        node.path = node._get_path(parent.path, node.depth, step)
+        # Cached by treebeard for MP_Node.get_parent
+        node._cached_parent_obj = parent
+
+    if hasattr(node, "set_url_path"):
+        node.set_url_path(parent)
+    return node
+
+
+def get_built_children(node):
+    """Return the children attached to `node` with attach_child"""
+    return node.__dict__.get("_built_children", [])
+
+
+def create_tree(parent, branching, build_node, batch_size=None):
+    """
+    Create a tree of nodes under the saved `parent`, and return them in tree order.
+
+    `branching` gives the number of children of each node at each level below `parent`,
+    e.g. `[3, 2]` for three children of `parent` with two children each. `build_node` is
+    called with the position of each node (its 1-based index under each ancestor below
+    `parent`, e.g. `(3, 1)`) and returns it unsaved.
+
+    Paths are worked out in memory from the last child of `parent`, and nodes are inserted
+    with bulk_create (per `batch_size` nodes), so nodes must be of a model with a single
+    table, e.g. collections, not pages.
+    """
+    nodes = []
+
+    def add_children(node, position, first_step):
+        level = len(position)
+        numchild = branching[level + 1] if level + 1 < len(branching) else 0
+        for n in range(1, branching[level] + 1):
+            child = build_node((*position, n))
+            child.depth = node.depth + 1
+            child.path = node._get_path(node.path, child.depth, first_step + n)
+            child.numchild = numchild
+            nodes.append(child)
+            if numchild:
+                add_children(child, (*position, n), 0)
+
+    if not branching or not branching[0]:
+        return nodes
+    last_child = parent.get_last_child()
+    step = parent._str2int(last_child.path[-parent.steplen :]) if last_child else 0
+    add_children(parent, (), step)
+
+    using = parent._state.db
+    manager = type(parent)._default_manager.using(using)
+    with transaction.atomic(using=using):
+        manager.bulk_create(nodes, batch_size=batch_size)
+        if any(node.pk is None for node in nodes):
+            # Primary keys weren't returned by the database, so look them up
+            ids = dict(
+                manager.filter(path__in=[node.path for node in nodes]).values_list(
+                    "path", "pk"
+                )
+            )
+            for node in nodes:
+                node.pk = ids[node.path]
+        manager.filter(pk=parent.pk).update(numchild=F("numchild") + branching[0])
+    parent.refresh_from_db(fields=["numchild"])
+    return nodes
+
+
+def copy_page(source):
+    """
+    Copy the field values of the specific page `source` to a new, unsaved instance, clearing
+    its primary key, parent links and revisions
+    """
+    model = source.specific_class
+    values = {
+        field.attname: getattr(source, field.attname)
+        for field in model._meta.concrete_fields
+        if not field.primary_key
+        and not getattr(field.remote_field, "parent_link", False)
+    }
+    values.update(
+        latest_revision_id=None,
+        live_revision_id=None,
+        latest_revision_created_at=None,
+        alias_of_id=None,
+    )
+    return model(**values)
+
+
+def get_available_slug(slug, used_slugs):
+    """Return `slug`, with a numeric suffix if needed to avoid `used_slugs`"""
+    candidate = slug
+    number = 1
+    while candidate in used_slugs:
+        candidate = f"{slug}-{number}"
+        number += 1
+    return candidate
+
+
+def insert_pages(pages, using, batch_size=None):
+    """
+    Insert the unsaved specific `pages`, with a bulk query per table: bulk_create for the
+    Page table, and a batched insert of local fields for each table inheriting from it,
+    which bulk_create doesn't support.
+    """
+    Page.objects.using(using).bulk_create(pages, batch_size=batch_size)
+    if any(p.id is None for p in pages):
+        # Primary keys weren't returned by the database, so look them up
+        ids = dict(
+            Page.objects.using(using)
+            .filter(path__in=[p.path for p in pages])
+            .values_list("path", "id")
+        )
+        for p in pages:
+            p.id = ids[p.path]
+
+    by_model = defaultdict(list)
+    for p in pages:
+        by_model[p._meta.concrete_model].append(p)
+
+    for model, model_pages in by_model.items():
+        for ancestor in [*reversed(model._meta.get_parent_list()), model]:
+            if ancestor is Page:
+                continue
+            for p in model_pages:
+                setattr(p, ancestor._meta.pk.attname, p.id)
+            # bulk_create refuses multi-table inherited models, so use the batched insert
+            # it's built on (private API, with this signature in Django 4.2 to 5.2)
+            ancestor._base_manager.using(using)._batched_insert(
+                model_pages, ancestor._meta.local_concrete_fields, batch_size
+            )
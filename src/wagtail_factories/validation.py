@@ -0,0 +1,154 @@
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from wagtail import blocks
+
+__all__ = [
+    "ValidationReport",
+    "get_error_locations",
+    "validate_stream_value",
+    "validate_stream_values",
+]
+
+
+def validate_stream_value(value, block_def=None):
+    """
+    Validate a generated stream against its StreamBlock definition in a single pass,
+    returning the cleaned StreamValue or raising a ValidationError.
+
+    `block_def` is required if `value` is not a StreamValue (e.g. a list of
+    (block_name, value) tuples from an old style StreamFieldFactory declaration).
+    """
+    if block_def is None:
+        if not isinstance(value, blocks.StreamValue):
+            raise TypeError(
+                "validate_stream_value requires a block_def for values that are not "
+                "StreamValues"
+            )
+        block_def = value.stream_block
+    elif not isinstance(value, blocks.StreamValue):
+        value = blocks.StreamValue(block_def, value)
+    return block_def.clean(value)
+
+
+def get_error_locations(error, path=()):
+    """
+    Flatten a (possibly nested) block ValidationError into a dict mapping the location of
+    each error, as a dotted path of stream/list indexes and struct child names, to a list
+    of messages.
+    """
+    locations = {}
+    block_errors = getattr(error, "block_errors", None) or {}
+    for key, child_error in block_errors.items():
+        locations.update(get_error_locations(child_error, (*path, str(key))))
+
+    if hasattr(error, "non_block_errors"):
+        messages = ValidationError(error.non_block_errors.as_data()).messages
+    elif not block_errors:
+        messages = error.messages
+    else:
+        messages = []
+    if messages:
+        locations[".".join(path)] = messages
+    return locations
+
+
+class ValidationReport:
+    def __init__(self, total, errors, duration):
+        self.total = total
+        # Mapping of value index -> {error location: [messages]}
+        self.errors = errors
+        # Wall clock time taken to validate all values, in seconds
+        self.duration = duration
+
+    def __repr__(self):
+        return (
+            f"<{type(self).__name__} {len(self.errors)}/{self.total} invalid "
+            f"in {self.duration:.3f}s>"
+        )
+
+    @property
+    def is_valid(self):
+        return not self.errors
+
+    @property
+    def location_counts(self):
+        """Count of invalid values per error location, across all values"""
+        return Counter(
+            location for locations in self.errors.values() for location in locations
+        )
+
+
+def _get_stream_block(reference):
+    """Return the StreamBlock of a StreamField referenced as app_label.Model.field"""
+    model_label, _, field_name = reference.rpartition(".")
+    return apps.get_model(model_label)._meta.get_field(field_name).stream_block
+
+
+def _validate_chunk(values, start, block_def, raw=False):
+    if isinstance(block_def, str):
+        block_def = _get_stream_block(block_def)
+    errors = {}
+    for i, value in enumerate(values, start):
+        if raw:
+            value = block_def.to_python(value)
+        try:
+            validate_stream_value(value, block_def)
+        except ValidationError as err:
+            errors[i] = get_error_locations(err)
+    return errors
+
+
+def validate_stream_values(values, block_def=None, executor=None, chunk_size=100):
+    """
+    Validate many generated streams (see validate_stream_value), returning a
+    ValidationReport rather than raising on the first invalid value.
+
+    `block_def` may also be given as a reference to a StreamField, in the form
+    "app_label.Model.field_name".
+
+    Values are validated in chunks of `chunk_size`, on `executor` (a
+    concurrent.futures.Executor) if given, else in the calling thread. Note that chooser
+    blocks query the database while validating, so with a thread pool each worker uses its
+    own database connection. A process pool requires `block_def` as a StreamField
+    reference: values are sent to the workers as raw stream data, and rebuilt there from
+    the field's StreamBlock, so Django must be set up in each worker (e.g. with
+    `ProcessPoolExecutor(initializer=django.setup)`).
+    """
+    values = list(values)
+    start_time = time.perf_counter()
+    raw = isinstance(executor, ProcessPoolExecutor)
+    if raw:
+        if not isinstance(block_def, str):
+            raise TypeError(
+                "validate_stream_values requires a block_def of the form "
+                '"app_label.Model.field_name" to validate on a process pool'
+            )
+        stream_block = _get_stream_block(block_def)
+        values = [
+            (
+                value
+                if isinstance(value, blocks.StreamValue)
+                else blocks.StreamValue(stream_block, value)
+            ).get_prep_value()
+            for value in values
+        ]
+    elif isinstance(block_def, str):
+        block_def = _get_stream_block(block_def)
+
+    chunks = [
+        (values[start : start + chunk_size], start, block_def, raw)
+        for start in range(0, len(values), chunk_size)
+    ]
+    if executor is None:
+        results = [_validate_chunk(*chunk) for chunk in chunks]
+    else:
+        results = executor.map(_validate_chunk, *zip(*chunks)) if chunks else []
+
+    errors = {}
+    for chunk_errors in results:
+        errors.update(chunk_errors)
+    return ValidationReport(len(values), errors, time.perf_counter() - start_time)
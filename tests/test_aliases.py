@@ -0,0 +1,56 @@
+import pytest
+from wagtail.models import Page
+
+import wagtail_factories
+from tests.testapp.factories import MyTestPageFactory
+from tests.testapp.models import MyTestPage
+
+
+@pytest.fixture
+def root_page():
+    return wagtail_factories.PageFactory(parent=None)
+
+
+@pytest.fixture
+def section(root_page):
+    section = wagtail_factories.PageFactory(parent=root_page, title="Section")
+    article = MyTestPageFactory(parent=section, title="Article")
+    MyTestPageFactory(parent=article, title="Comments")
+    MyTestPageFactory(parent=section, title="Other article", live=False)
+    return section
+
+
+@pytest.mark.django_db
+def test_create_aliases(root_page, section):
+    mirror = wagtail_factories.PageFactory(parent=root_page, title="Mirror")
+    aliases = wagtail_factories.PageFactory.create_aliases([section], mirror)
+
+    source_pages = list(section.get_descendants(inclusive=True).specific())
+    assert [alias.alias_of_id for alias in aliases] == [p.pk for p in source_pages]
+    assert [alias.title for alias in aliases] == [p.title for p in source_pages]
+    assert not {alias.translation_key for alias in aliases} & {
+        p.translation_key for p in source_pages
+    }
+
+    section_alias = mirror.get_children().get()
+    assert section_alias.pk == aliases[0].pk
+    assert section_alias.url_path == "/mirror/section/"
+    comments = Page.objects.get(alias_of=source_pages[2])
+    assert comments.url_path == "/mirror/section/article/comments/"
+    assert isinstance(comments.specific, MyTestPage)
+    assert not Page.objects.get(alias_of=source_pages[3]).live
+
+    assert Page.find_problems() == ([], [], [], [], [])
+
+
+@pytest.mark.django_db
+def test_create_aliases_not_recursive(root_page, section):
+    aliases = wagtail_factories.PageFactory.create_aliases(
+        [section, section], root_page, recursive=False
+    )
+
+    assert [alias.slug for alias in aliases] == ["section-1", "section-2"]
+    assert all(alias.numchild == 0 for alias in aliases)
+    root_page.refresh_from_db()
+    assert root_page.numchild == 3
+    assert Page.find_problems() == ([], [], [], [], [])
@@ -1,10 +1,21 @@
+import time
 from collections import OrderedDict
 
+import factory
 import pytest
-from wagtail.blocks import CharBlock, StructBlock, StructValue
+from django.core.exceptions import ValidationError
+from wagtail.blocks import (
+    CharBlock,
+    StreamBlock,
+    StreamValue,
+    StructBlock,
+    StructValue,
+    URLBlock,
+)
 from wagtail.documents.models import Document
 from wagtail.images.models import Image
 from wagtail.models import Page
+from wagtail.rich_text import RichText
 
 import wagtail_factories
 from tests.testapp.factories import (
@@ -12,6 +23,11 @@ from tests.testapp.factories import (
     MyBlockItemFactory,
     MyTestPageWithStreamFieldFactory,
 )
+from wagtail_factories.blocks import BlockFactory
+
+
+class URLStreamBlock(StreamBlock):
+    url = URLBlock()
 
 
 def eq_list_block_values(p, q):
@@ -301,3 +317,161 @@ def test_custom_struct_value_used():
 
     instance = CustomStructBlockFactory.build()
     assert instance.foo() == BAR_DEFAULT
+
+
+@pytest.mark.django_db
+def test_list_block_factory_list_of_size():
+    computed = MyBlockFactory(
+        items=wagtail_factories.ListOf(size=3, label="label"),
+        items__1__label="other label",
+        image__image=None,
+    )
+
+    assert [item["label"] for item in computed["items"]] == [
+        "label",
+        "other label",
+        "label",
+    ]
+    assert [item["value"] for item in computed["items"]] == [100, 100, 100]
+
+
+@pytest.mark.django_db
+def test_list_block_factory_list_of_params():
+    computed = MyBlockFactory(
+        items=wagtail_factories.ListOf(
+            params=[{"label": "label-1"}, {"label": "label-2"}], value=1
+        ),
+        image__image=None,
+    )
+
+    assert [(item["label"], item["value"]) for item in computed["items"]] == [
+        ("label-1", 1),
+        ("label-2", 1),
+    ]
+
+
+def test_list_of_invalid_arguments():
+    with pytest.raises(TypeError, match="requires either size or params"):
+        wagtail_factories.ListOf(label="label")
+    with pytest.raises(ValueError, match="got size 3 but 1 sets of params"):
+        wagtail_factories.ListOf(size=3, params=[{}])
+
+
+def test_corpus_text_block_factories():
+    char_value = wagtail_factories.CorpusCharBlockFactory()
+    text_value = wagtail_factories.CorpusTextBlockFactory()
+    rich_text_value = wagtail_factories.CorpusRichTextBlockFactory()
+
+    assert isinstance(char_value, str)
+    assert char_value.endswith(".")
+    assert isinstance(text_value, str)
+    assert isinstance(rich_text_value, RichText)
+    assert rich_text_value.source.startswith("<p>")
+
+
+def test_corpus_text_length_and_corpus():
+    text = wagtail_factories.CorpusText(length=5, corpus=["foo", "bar"], seed=1)
+
+    values = [text.generate() for _ in range(3)]
+    assert all(len(value.split()) == 5 for value in values)
+    assert {word.strip(".").lower() for value in values for word in value.split()} <= {
+        "foo",
+        "bar",
+    }
+
+
+def test_corpus_text_is_reproducible():
+    length = wagtail_factories.LogNormalLength(mu=2, sigma=1)
+    first = wagtail_factories.CorpusText(length=length, seed=3, buffer_size=8)
+    second = wagtail_factories.CorpusText(length=length, seed=3, buffer_size=8)
+
+    assert [first.generate() for _ in range(20)] == [
+        second.generate() for _ in range(20)
+    ]
+
+
+def test_corpus_text_reseed():
+    text = wagtail_factories.CorpusText(
+        length=wagtail_factories.LogNormalLength(), buffer_size=8
+    )
+
+    factory.random.reseed_random("corpus")
+    first = [text.generate() for _ in range(5)]
+    factory.random.reseed_random("corpus")
+    second = [text.generate() for _ in range(5)]
+    assert first == second
+
+    # Draws from the shared generator in between don't change the text
+    factory.random.reseed_random("corpus")
+    third = [text.generate() for _ in range(2)]
+    factory.random.randgen.random()
+    third += [text.generate() for _ in range(3)]
+    factory.random.reseed_random("corpus")
+    fourth = [text.generate() for _ in range(2)]
+    factory.random.randgen.random()
+    fourth += [text.generate() for _ in range(3)]
+    assert third == fourth == first
+
+
+def test_corpus_text_throughput():
+    def time_sentences(generate):
+        start = time.perf_counter()
+        for _ in range(5000):
+            generate()
+        return time.perf_counter() - start
+
+    factory.random.reseed_random("throughput")
+    text = wagtail_factories.CorpusText()
+    fake = factory.Faker._get_faker()
+    corpus_time = min(time_sentences(text.generate) for _ in range(3))
+    faker_time = min(time_sentences(fake.sentence) for _ in range(3))
+
+    assert corpus_time < faker_time
+
+
+class URLBlockFactory(BlockFactory):
+    class Meta:
+        model = URLBlock
+
+
+class TrustedURLBlockFactory(URLBlockFactory):
+    class Meta:
+        skip_clean = True
+
+
+def test_block_factory_cleans_value():
+    assert URLBlockFactory(value="https://example.com") == "https://example.com"
+    with pytest.raises(ValidationError):
+        URLBlockFactory(value="not a url")
+
+
+def test_block_factory_skip_clean():
+    assert URLBlockFactory(value="not a url", skip_clean=True) == "not a url"
+    assert TrustedURLBlockFactory(value="not a url") == "not a url"
+    with pytest.raises(ValidationError):
+        TrustedURLBlockFactory(value="not a url", skip_clean=False)
+
+
+def test_validate_stream_value():
+    class URLStreamBlockFactory(wagtail_factories.StreamBlockFactory):
+        url = factory.SubFactory(TrustedURLBlockFactory)
+
+        class Meta:
+            model = URLStreamBlock
+
+    valid = URLStreamBlockFactory(blocks=[("url", {"value": "https://example.com"})])
+    cleaned = wagtail_factories.validate_stream_value(valid)
+    assert isinstance(cleaned, StreamValue)
+    assert cleaned[0].value == "https://example.com"
+
+    invalid = URLStreamBlockFactory(
+        blocks=[("url", {"value": "https://example.com"}), ("url", {"value": "foo"})]
+    )
+    with pytest.raises(ValidationError) as excinfo:
+        wagtail_factories.validate_stream_value(invalid)
+    assert list(excinfo.value.block_errors) == [1]
+
+    with pytest.raises(TypeError, match="requires a block_def"):
+        wagtail_factories.validate_stream_value([("url", "foo")])
+    with pytest.raises(ValidationError):
+        wagtail_factories.validate_stream_value([("url", "foo")], URLStreamBlock())
@@ -0,0 +1,47 @@
+import pytest
+from wagtail.models import Page
+
+import wagtail_factories
+from tests.testapp.models import PageWithStreamBlock
+from tests.testapp.stream_block_factories import PageWithStreamBlockFactory
+
+
+@pytest.mark.django_db
+def test_create_clone_batch():
+    root_page = wagtail_factories.PageFactory(parent=None)
+    pages = PageWithStreamBlockFactory.create_clone_batch(
+        4,
+        parent=root_page,
+        title="Clone",
+        body__0__char_block="shared body",
+        vary={"title": lambda n: f"Clone {n}"},
+    )
+
+    assert [page.title for page in pages] == ["Clone", "Clone 1", "Clone 2", "Clone 3"]
+    assert [page.slug for page in pages] == ["clone", "clone-1", "clone-2", "clone-3"]
+    assert len({page.translation_key for page in pages}) == 4
+
+    saved_pages = list(PageWithStreamBlock.objects.child_of(root_page).order_by("path"))
+    assert [page.pk for page in saved_pages] == [page.pk for page in pages]
+    for page in saved_pages:
+        assert page.draft_title == page.title
+        assert page.url_path == f"/{page.slug}/"
+        assert page.body[0].block_type == "char_block"
+        assert page.body[0].value == "shared body"
+        assert page.body[0].id == pages[0].body[0].id
+
+    root_page.refresh_from_db()
+    assert root_page.numchild == 4
+    assert Page.find_problems() == ([], [], [], [], [])
+
+
+@pytest.mark.django_db
+def test_create_clones_slug_taken():
+    root_page = wagtail_factories.PageFactory(parent=None)
+    prototype = wagtail_factories.PageFactory(parent=root_page, slug="page")
+    wagtail_factories.PageFactory(parent=root_page, slug="page-2")
+
+    clones = wagtail_factories.create_clones(prototype, root_page, 3)
+
+    assert [page.slug for page in clones] == ["page-1", "page-2-1", "page-3"]
+    assert Page.find_problems() == ([], [], [], [], [])
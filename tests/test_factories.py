@@ -1,9 +1,19 @@
+import hashlib
+import os
+
+import factory
 import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from taggit.models import Tag
 from wagtail import blocks
-from wagtail.models import Page, Site
+from wagtail.documents import get_document_model
+from wagtail.images import get_image_model
+from wagtail.models import Collection, GroupCollectionPermission, Page, Site
 
 import wagtail_factories
 from tests.testapp.factories import MyTestPageFactory, MyTestPageGetOrCreateFactory
+from wagtail_factories.factories import CollectionMemberFactory
 
 
 @pytest.mark.django_db
@@ -132,6 +142,36 @@ def test_image_no_args_or_kwargs():
     assert image.collection.name == "Test collection"
 
 
+@pytest.mark.django_db
+def test_image_renditions():
+    image = wagtail_factories.ImageFactory(renditions=["fill-80x60", "width-400"])
+
+    renditions = {r.filter_spec: r for r in image.renditions.all()}
+    assert (renditions["fill-80x60"].width, renditions["fill-80x60"].height) == (80, 60)
+    # Filters don't upscale, so the 100px wide image stays at 100px
+    assert (renditions["width-400"].width, renditions["width-400"].height) == (100, 100)
+    assert renditions["fill-80x60"].file.name == renditions["width-400"].file.name
+
+    # Existing renditions are used rather than generating new ones
+    image = get_image_model().objects.get(pk=image.pk)
+    assert image.get_rendition("fill-80x60").pk == renditions["fill-80x60"].pk
+
+
+@pytest.mark.django_db
+def test_bulk_image_renditions(django_assert_num_queries):
+    images = BulkImageFactory.create_batch(3, renditions=["fill-80x60", "width-50"])
+
+    Rendition = get_image_model().get_rendition_model()
+    assert Rendition.objects.filter(image__in=images).count() == 6
+    assert {
+        (r.width, r.height) for r in Rendition.objects.filter(filter_spec="width-50")
+    } == {(50, 50)}
+
+    # One query inserts the renditions for every image
+    with django_assert_num_queries(1):
+        BulkImageFactory.renditions.add_renditions(images, ["fill-10x10"])
+
+
 @pytest.mark.django_db
 def test_image_add_to_collection():
     root_collection = wagtail_factories.CollectionFactory(parent=None)
@@ -171,3 +211,374 @@ def test_document_add_to_collection():
         collection__parent=root_collection, collection__name="new"
     )
     assert document.collection.name == "new"
+
+
+class BulkSiteFactory(wagtail_factories.SiteFactory):
+    class Meta:
+        bulk_create = True
+
+
+class BulkImageFactory(wagtail_factories.ImageFactory):
+    class Meta:
+        bulk_create = True
+
+
+class BulkDocumentFactory(wagtail_factories.DocumentFactory):
+    class Meta:
+        bulk_create = True
+
+
+@pytest.mark.django_db
+def test_bulk_create_sites():
+    Site.objects.all().delete()
+    sites = BulkSiteFactory.create_batch(3, root_page__title="Bulk root")
+
+    assert Site.objects.count() == 3
+    assert all(site.pk for site in sites)
+    assert len({site.root_page.pk for site in sites}) == 3
+    assert all(site.root_page.title == "Bulk root" for site in sites)
+    assert all(site.root_page.depth == 1 for site in sites)
+
+
+@pytest.mark.django_db
+def test_bulk_create_without_returned_pks(monkeypatch):
+    monkeypatch.setattr(
+        type(connection.features), "can_return_rows_from_bulk_insert", False
+    )
+    root_page = wagtail_factories.PageFactory(parent=None)
+    sites = BulkSiteFactory.create_batch(
+        2, root_page=root_page, hostname=factory.Sequence(lambda n: f"site{n}")
+    )
+
+    assert all(site.pk for site in sites)
+    assert {site.pk for site in sites} == set(
+        Site.objects.filter(root_page=root_page).values_list("pk", flat=True)
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_create_images():
+    collection = wagtail_factories.CollectionFactory(parent=None)
+    images = BulkImageFactory.create_batch(2, collection=collection)
+
+    assert get_image_model().objects.filter(collection=collection).count() == 2
+    for image in images:
+        image.refresh_from_db()
+        assert image.width == image.height == 100
+        assert image.file_size == image.file.size
+        assert len(image.file_hash) == 40
+
+
+@pytest.mark.django_db
+def test_bulk_create_documents():
+    documents = BulkDocumentFactory.create_batch(2, collection__name="Bulk collection")
+
+    assert get_document_model().objects.count() == 2
+    assert len({document.collection.pk for document in documents}) == 2
+    for document in documents:
+        document.refresh_from_db()
+        assert document.collection.name == "Bulk collection"
+        assert document.file_hash
+
+
+class DedupImageFactory(wagtail_factories.ImageFactory):
+    class Meta:
+        dedup_files = True
+
+
+class BulkDedupDocumentFactory(wagtail_factories.DocumentFactory):
+    file = factory.django.FileField(data=b"same content")
+
+    class Meta:
+        bulk_create = True
+        dedup_files = True
+
+
+@pytest.mark.django_db
+def test_dedup_image_files():
+    wagtail_factories.clear_stored_files()
+    images = DedupImageFactory.create_batch(3)
+    other = DedupImageFactory(file__color="red")
+
+    assert len({image.file.name for image in images}) == 1
+    assert other.file.name != images[0].file.name
+    for image in images:
+        image.refresh_from_db()
+        assert (image.width, image.height) == (100, 100)
+
+
+@pytest.mark.django_db
+def test_dedup_document_files_bulk():
+    wagtail_factories.clear_stored_files()
+    documents = BulkDedupDocumentFactory.create_batch(3)
+
+    assert len({document.file.name for document in documents}) == 1
+    for document in documents:
+        document.refresh_from_db()
+        assert document.file.read() == b"same content"
+
+    # Files deleted from storage are stored again
+    documents[0].file.storage.delete(documents[0].file.name)
+    document = BulkDedupDocumentFactory()
+    assert document.file.storage.exists(document.file.name)
+
+
+@pytest.mark.django_db
+def test_streamed_document_file():
+    size = 3 * 2**16 + 5
+    document = wagtail_factories.DocumentFactory(
+        file=wagtail_factories.StreamedFileField(size=size, chunk_size=2**16, seed=1)
+    )
+
+    document.refresh_from_db()
+    assert document.file_size == size
+    with document.open_file() as f:
+        content = f.read()
+    assert len(content) == size
+    assert content[: 2**16] == content[2**16 : 2**17]
+    assert document.file_hash == hashlib.sha1(content).hexdigest()  # noqa: S324
+
+
+@pytest.mark.django_db
+def test_streamed_document_files_bulk():
+    documents = BulkDocumentFactory.create_batch(
+        2, file=wagtail_factories.StreamedFileField(size=1000, chunk_size=64)
+    )
+
+    for document in documents:
+        document.refresh_from_db()
+        assert document.file_size == 1000
+        with document.open_file() as f:
+            assert document.file_hash == hashlib.sha1(f.read()).hexdigest()  # noqa: S324
+
+
+class LazyImageFactory(wagtail_factories.ImageFactory):
+    class Meta:
+        lazy_files = True
+
+
+class LazyDocumentFactory(wagtail_factories.DocumentFactory):
+    file = factory.django.FileField(data=b"lazy content")
+
+    class Meta:
+        lazy_files = True
+
+
+@pytest.fixture
+def lazy_storage(monkeypatch, settings):
+    storage = wagtail_factories.LazyFileSystemStorage(location=settings.MEDIA_ROOT)
+    for model in (get_image_model(), get_document_model()):
+        monkeypatch.setattr(model._meta.get_field("file"), "storage", storage)
+    return storage
+
+
+@pytest.mark.django_db
+def test_lazy_image_file(lazy_storage):
+    image = LazyImageFactory()
+    name = image.file.name
+
+    assert name in lazy_storage.deferred_files
+    assert not os.path.exists(os.path.join(lazy_storage.location, name))
+    image = get_image_model().objects.get(pk=image.pk)
+    assert (image.width, image.height) == (100, 100)
+    assert image.file_size == lazy_storage.size(name)
+
+    with image.open_file() as f:
+        assert hashlib.sha1(f.read()).hexdigest() == image.file_hash  # noqa: S324
+    assert name not in lazy_storage.deferred_files
+    assert os.path.exists(os.path.join(lazy_storage.location, name))
+
+
+@pytest.mark.django_db
+def test_lazy_document_files(lazy_storage):
+    documents = LazyDocumentFactory.create_batch(2)
+    other = LazyDocumentFactory(file__data=b"other content")
+
+    assert len({d.file.name for d in documents + [other]}) == 3
+    assert all(d.file.name in lazy_storage.deferred_files for d in documents)
+    document = get_document_model().objects.get(pk=documents[1].pk)
+    with document.open_file() as f:
+        assert f.read() == b"lazy content"
+    assert documents[0].file.name in lazy_storage.deferred_files
+
+
+@pytest.mark.django_db
+def test_lazy_streamed_files(lazy_storage):
+    document = LazyDocumentFactory(
+        file=wagtail_factories.StreamedFileField(size=1000, chunk_size=64)
+    )
+    name = document.file.name
+
+    # Only the values needed to generate the file again are kept
+    assert isinstance(lazy_storage.deferred_files[name], tuple)
+    assert lazy_storage.size(name) == document.file_size == 1000
+    with document.open_file() as f:
+        content = f.read()
+    assert len(content) == 1000
+    assert hashlib.sha1(content).hexdigest() == document.file_hash  # noqa: S324
+
+
+@pytest.mark.django_db
+def test_clear_deferred_files(lazy_storage):
+    document = LazyDocumentFactory()
+    lazy_storage.clear_deferred_files()
+    assert not lazy_storage.exists(document.file.name)
+
+
+@pytest.mark.django_db
+def test_lazy_files_need_lazy_storage():
+    document = LazyDocumentFactory()
+    with document.open_file() as f:
+        assert f.read() == b"lazy content"
+
+
+class TaggedDocumentFactory(wagtail_factories.DocumentFactory):
+    tags = wagtail_factories.Tags(["red", "green", "blue"], count=2, seed=1)
+
+    class Meta:
+        bulk_create = True
+
+
+@pytest.mark.django_db
+def test_image_tags():
+    image = wagtail_factories.ImageFactory(tags=["Nature", "city"])
+
+    assert sorted(image.tags.names()) == ["Nature", "city"]
+    assert sorted(Tag.objects.values_list("slug", flat=True)) == ["city", "nature"]
+
+
+@pytest.mark.django_db
+def test_tags_with_colliding_slugs():
+    Tag.objects.create(name="Existing")
+    Tag.objects.create(name="C_1")
+    image = wagtail_factories.ImageFactory(
+        tags=["C++", "C", "Nature", "nature", "existing"]
+    )
+
+    assert sorted(image.tags.names()) == ["C", "C++", "Nature", "existing", "nature"]
+    assert dict(Tag.objects.values_list("name", "slug")) == {
+        "C": "c",
+        "C++": "c_2",
+        "C_1": "c_1",
+        "Existing": "existing",
+        "Nature": "nature",
+        "existing": "existing_1",
+        "nature": "nature_1",
+    }
+
+
+@pytest.mark.django_db
+def test_bulk_tags(django_assert_num_queries):
+    documents = TaggedDocumentFactory.create_batch(5)
+
+    assert Tag.objects.count() == 3
+    for document in documents:
+        assert len(document.tags.all()) == 2
+
+    # One query for the existing tags, and one to insert the tagged items
+    with django_assert_num_queries(2):
+        TaggedDocumentFactory.tags.add_tags(documents, ["red"])
+    assert Tag.objects.count() == 3
+    assert all("red" in document.tags.names() for document in documents)
+
+
+class CollectionPermissionFactory(CollectionMemberFactory):
+    group = factory.SubFactory(wagtail_factories.GroupFactory)
+    permission = factory.LazyFunction(
+        lambda: wagtail_factories.get_permissions(["wagtailimages.add_image"])[0]
+    )
+
+    class Meta:
+        model = GroupCollectionPermission
+
+
+@pytest.mark.django_db
+def test_collection_member_without_tags():
+    permission = CollectionPermissionFactory()
+    assert permission.pk is not None
+
+
+def test_tags_count_distribution():
+    tags = wagtail_factories.Tags(
+        ["a", "b", "c"], count=wagtail_factories.ZipfLength(maximum=5), seed=1
+    )
+    for names in tags.sample(20):
+        assert 1 <= len(names) <= 3
+        assert len(set(names)) == len(names)
+
+
+class AtomicBatchPageFactory(wagtail_factories.PageFactory):
+    title = factory.Sequence(lambda n: f"Batch page {n}")
+
+    class Meta:
+        atomic_batch = True
+        batch_chunk_size = 2
+
+
+class FlakyCollectionFactory(wagtail_factories.CollectionFactory):
+    name = factory.Sequence(lambda n: f"Collection {n}")
+
+    class Meta:
+        atomic_batch = True
+
+    @classmethod
+    def _create_instance(cls, model_class, parent, kwargs):
+        instance = super()._create_instance(model_class, parent, kwargs)
+        if instance.name.endswith("1"):
+            raise IntegrityError("simulated failure")
+        return instance
+
+
+@pytest.mark.django_db
+def test_atomic_create_batch():
+    root_page = wagtail_factories.PageFactory(parent=None)
+    pages = AtomicBatchPageFactory.create_batch(5, parent=root_page)
+
+    assert len(pages) == 5
+    assert root_page.get_children().count() == 5
+    root_page.refresh_from_db()
+    assert root_page.numchild == 5
+
+
+@pytest.mark.django_db
+def test_atomic_create_batch_skips_failed_nodes():
+    root_collection = Collection.get_first_root_node()
+    FlakyCollectionFactory.reset_sequence(force=True)
+    collections = FlakyCollectionFactory.create_batch(3, parent=root_collection)
+
+    assert [c.name for c in collections] == ["Collection 0", "Collection 2"]
+    assert not Collection.objects.filter(name="Collection 1").exists()
+    root_collection.refresh_from_db()
+    assert root_collection.numchild == 2
+
+
+@pytest.mark.django_db
+def test_atomic_create_batch_skips_invalid_nodes():
+    root_page = wagtail_factories.PageFactory(parent=None)
+    pages = AtomicBatchPageFactory.create_batch(3, parent=root_page, slug="same")
+
+    assert len(pages) == 1
+    assert root_page.get_children().get().pk == pages[0].pk
+    root_page.refresh_from_db()
+    assert root_page.numchild == 1
+
+
+class UnchunkedBatchPageFactory(AtomicBatchPageFactory):
+    class Meta:
+        batch_chunk_size = None
+
+
+@pytest.mark.django_db
+def test_atomic_create_batch_chunks():
+    root_page = wagtail_factories.PageFactory(parent=None)
+
+    def count_savepoints(factory_class):
+        with CaptureQueriesContext(connection) as context:
+            factory_class.create_batch(5, parent=root_page)
+        return sum(q["sql"].startswith("SAVEPOINT") for q in context.captured_queries)
+
+    # Five nodes in chunks of two open two more transactions than a single chunk
+    assert (
+        count_savepoints(AtomicBatchPageFactory)
+        == count_savepoints(UnchunkedBatchPageFactory) + 2
+    )
@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test.utils import CaptureQueriesContext
+from wagtail.models import Page, Site
+from wagtail.models.sites import (
+    SITE_ROOT_PATHS_CACHE_KEY,
+    SITE_ROOT_PATHS_CACHE_VERSION,
+)
+
+import wagtail_factories
+
+
+def create_pages():
+    root = wagtail_factories.PageFactory(parent=None, slug="generation-root")
+    for i in range(3):
+        wagtail_factories.PageFactory(parent=root, slug=f"page-{i}")
+    return root
+
+
+@pytest.mark.django_db
+def test_generation_context_saves_locale_queries():
+    # Warm up caches (e.g. content types), so that only locale queries differ
+    for _ in range(2):
+        with CaptureQueriesContext(connection) as without_context:
+            create_pages()
+        Page.objects.get(slug="generation-root").delete()
+
+    with CaptureQueriesContext(connection) as with_context:
+        with wagtail_factories.GenerationContext() as context:
+            root = create_pages()
+
+    assert context.queries_saved == 3
+    assert len(without_context) - len(with_context) == context.queries_saved
+    assert all(page.locale == root.locale for page in root.get_children())
+
+
+@pytest.mark.django_db
+def test_generation_context_defers_site_cache_invalidation():
+    Site.get_site_root_paths()
+
+    with wagtail_factories.GenerationContext() as context:
+        assert wagtail_factories.get_generation_context() is context
+        wagtail_factories.SiteFactory.create_batch(2)
+        # Root paths are still cached from before the context
+        assert cache.get(
+            SITE_ROOT_PATHS_CACHE_KEY, version=SITE_ROOT_PATHS_CACHE_VERSION
+        )
+
+    assert wagtail_factories.get_generation_context() is None
+    assert context.invalidations_deferred == 2
+    assert (
+        cache.get(SITE_ROOT_PATHS_CACHE_KEY, version=SITE_ROOT_PATHS_CACHE_VERSION)
+        is None
+    )
+    assert len(Site.get_site_root_paths()) == Site.objects.count()
+
+    # Wagtail's handler is connected again
+    wagtail_factories.SiteFactory()
+    assert (
+        cache.get(SITE_ROOT_PATHS_CACHE_KEY, version=SITE_ROOT_PATHS_CACHE_VERSION)
+        is None
+    )
+
+
+@pytest.mark.django_db
+def test_generation_context_only_defers_in_its_thread():
+    site = wagtail_factories.SiteFactory()
+    Site.get_site_root_paths()
+
+    def save_site():
+        post_save.send(sender=Site, instance=site, created=False)
+
+    with wagtail_factories.GenerationContext() as context:
+        thread = threading.Thread(target=save_site)
+        thread.start()
+        thread.join()
+        # The save in the other thread cleared the cache as usual
+        assert (
+            cache.get(SITE_ROOT_PATHS_CACHE_KEY, version=SITE_ROOT_PATHS_CACHE_VERSION)
+            is None
+        )
+
+    assert context.invalidations_deferred == 0
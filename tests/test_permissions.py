@@ -0,0 +1,99 @@
+import pytest
+from django.contrib.auth.models import Group, Permission
+from wagtail.models import (
+    Collection,
+    GroupCollectionPermission,
+    GroupPagePermission,
+    Page,
+)
+
+import wagtail_factories
+
+
+@pytest.mark.django_db
+def test_collection_tree_permissions():
+    editors = Group.objects.create(name="Tree editors")
+    moderators = Group.objects.create(name="Tree moderators")
+    add_image = Permission.objects.get(
+        content_type__app_label="wagtailimages", codename="add_image"
+    )
+
+    collections = wagtail_factories.CollectionFactory.create_tree(
+        Collection.get_first_root_node(),
+        [2, 2],
+        permissions={
+            editors: [add_image, "wagtaildocs.add_document"],
+            moderators: ["wagtailimages.change_image"],
+        },
+    )
+
+    assert GroupCollectionPermission.objects.filter(group=editors).count() == 12
+    leaf = collections[-1]
+    assert set(
+        leaf.group_permissions.filter(group=moderators).values_list(
+            "permission__codename", flat=True
+        )
+    ) == {"change_image"}
+
+
+@pytest.mark.django_db
+def test_collection_permissions_ignore_existing():
+    editors = Group.objects.create(name="Tree editors")
+    collection = wagtail_factories.CollectionFactory(parent=None)
+    permissions = {editors: ["wagtailimages.add_image"]}
+
+    wagtail_factories.create_collection_permissions(permissions, [collection])
+    wagtail_factories.create_collection_permissions(permissions, [collection])
+    assert GroupCollectionPermission.objects.filter(group=editors).count() == 1
+
+
+@pytest.mark.django_db
+def test_unknown_permission():
+    with pytest.raises(Permission.DoesNotExist):
+        wagtail_factories.get_permissions(["wagtailimages.fly"])
+
+
+@pytest.mark.django_db
+def test_group_page_permission_factory():
+    permission = wagtail_factories.GroupPagePermissionFactory()
+
+    assert permission.permission.codename == "change_page"
+    assert permission.page.group_permissions.get() == permission
+
+
+@pytest.mark.django_db
+def test_page_permissions_for_subtree(django_assert_num_queries):
+    root = wagtail_factories.PageFactory(parent=None)
+    section = wagtail_factories.PageFactory(parent=root, slug="section")
+    pages = wagtail_factories.PageFactory.create_clone_batch(4, parent=section)
+    outside = wagtail_factories.PageFactory(parent=root, slug="outside")
+    groups = wagtail_factories.GroupFactory.create_batch(2)
+
+    # One query for the permissions, one for the pages and one for the insert
+    with django_assert_num_queries(3):
+        wagtail_factories.GroupPagePermissionFactory.create_for_subtree(
+            section, groups, ["add_page", "wagtailcore.publish_page"]
+        )
+
+    assert GroupPagePermission.objects.filter(group__in=groups).count() == 2 * 2 * 5
+    assert not outside.group_permissions.exists()
+    assert set(
+        pages[0]
+        .group_permissions.filter(group=groups[0])
+        .values_list("permission__codename", flat=True)
+    ) == {"add_page", "publish_page"}
+
+
+@pytest.mark.django_db
+def test_page_permissions_for_sample():
+    root = wagtail_factories.PageFactory(parent=None)
+    pages = wagtail_factories.PageFactory.create_clone_batch(10, parent=root)
+    group = wagtail_factories.GroupFactory()
+
+    wagtail_factories.GroupPagePermissionFactory.create_for_sample(
+        Page.objects.child_of(root), 4, [group], ["change_page"], seed=1
+    )
+
+    sampled = set(group.page_permissions.values_list("page_id", flat=True))
+    assert len(sampled) == 4
+    assert sampled <= {page.pk for page in pages}
@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+import pytest
+from wagtail.models import PageLogEntry
+
+import wagtail_factories
+from tests.testapp.factories import MyTestPageFactory
+
+
+@pytest.mark.django_db
+def test_page_revisions():
+    page = MyTestPageFactory(parent=None, revisions=3)
+
+    revisions = list(page.revisions.order_by("created_at"))
+    assert len(revisions) == 3
+    assert revisions[-1].created_at - revisions[0].created_at == timedelta(hours=2)
+    assert all(revision.content["title"] == page.title for revision in revisions)
+
+    page.refresh_from_db()
+    assert page.latest_revision == revisions[-1]
+    assert page.get_latest_revision_as_object().title == page.title
+    assert page.has_unpublished_changes
+    assert page.live_revision is None
+
+
+@pytest.mark.django_db
+def test_page_revisions_published():
+    page = MyTestPageFactory(
+        parent=None,
+        revisions=2,
+        revisions__publish=True,
+        revisions__interval=timedelta(days=1),
+    )
+
+    revisions = list(page.revisions.order_by("created_at"))
+    page.refresh_from_db()
+    assert page.live_revision == page.latest_revision == revisions[-1]
+    assert not page.has_unpublished_changes
+    assert page.first_published_at == revisions[0].created_at
+    assert page.last_published_at == revisions[-1].created_at
+
+    log_entries = PageLogEntry.objects.filter(page=page, action="wagtail.publish")
+    assert [entry.revision for entry in log_entries.order_by("timestamp")] == revisions
+
+
+@pytest.mark.django_db
+def test_no_revisions_by_default():
+    page = wagtail_factories.PageFactory(parent=None)
+    assert not page.revisions.exists()
+    assert page.latest_revision is None
+
+
+def test_no_revisions_when_building():
+    page = wagtail_factories.PageFactory.build(parent=None, revisions=2)
+    assert page.latest_revision is None
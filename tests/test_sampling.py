@@ -0,0 +1,138 @@
+import random
+import time
+
+import factory
+import pytest
+from wagtail import blocks
+
+import wagtail_factories
+from tests.testapp.stream_block_factories import MyStreamBlockFactory
+
+
+def test_sample_block_specs_fixed_length():
+    specs = wagtail_factories.sample_block_specs(
+        {"char_block": 3, "struct_block": 1, "image_block": 0}, 5, 10, seed=1
+    )
+    assert len(specs) == 10
+    assert all(len(spec) == 5 for spec in specs)
+    assert {name for spec in specs for name in spec} <= {"char_block", "struct_block"}
+
+
+def test_sample_block_specs_is_reproducible():
+    weights = {"char_block": 6, "struct_block": 3, "image_block": 1}
+    length = wagtail_factories.ZipfLength(a=1.5, maximum=20)
+    first = wagtail_factories.sample_block_specs(weights, length, 20, seed=42)
+    second = wagtail_factories.sample_block_specs(weights, length, 20, seed=42)
+    assert first == second
+
+
+def test_sample_block_specs_reseed():
+    weights = {"char_block": 6, "struct_block": 3, "image_block": 1}
+    factory.random.reseed_random("specs")
+    first = wagtail_factories.sample_block_specs(weights, 5, 20)
+    factory.random.reseed_random("specs")
+    second = wagtail_factories.sample_block_specs(weights, 5, 20)
+    assert first == second
+
+
+@pytest.mark.parametrize(
+    "length",
+    [
+        wagtail_factories.ZipfLength(a=2, maximum=8),
+        wagtail_factories.LogNormalLength(mu=1.5, sigma=1, minimum=2, maximum=8),
+    ],
+)
+def test_length_distributions_are_bounded(length):
+    lengths = length.sample(random.Random(0), 200)  # noqa: S311
+    assert len(lengths) == 200
+    assert min(lengths) >= 1
+    assert max(lengths) <= 8
+
+
+def test_generate_weighted_batch():
+    values = MyStreamBlockFactory.generate_weighted_batch(
+        factory.BUILD_STRATEGY, 3, {"char_block": 1}, 2, seed=0
+    )
+    assert len(values) == 3
+    for value in values:
+        assert isinstance(value, blocks.StreamValue)
+        assert [child.block_type for child in value] == ["char_block", "char_block"]
+
+
+class BufferedFakerFactory(factory.DictFactory):
+    word = wagtail_factories.BufferedFaker("word", buffer_size=4)
+    number = wagtail_factories.BufferedFaker(
+        "pyint", buffer_size=4, seed=7, min_value=0, max_value=9
+    )
+
+
+def test_buffered_faker_values():
+    values = BufferedFakerFactory.build_batch(10)
+    assert all(isinstance(value["word"], str) for value in values)
+    assert all(0 <= value["number"] <= 9 for value in values)
+
+
+def test_buffered_faker_call_time_arguments():
+    value = BufferedFakerFactory(number__min_value=10, number__max_value=10)
+    assert value["number"] == 10
+
+
+def test_buffered_faker_reseed():
+    factory.random.reseed_random("buffered")
+    first = [value["word"] for value in BufferedFakerFactory.build_batch(6)]
+
+    factory.random.reseed_random("buffered")
+    second = [value["word"] for value in BufferedFakerFactory.build_batch(6)]
+
+    assert first == second
+
+
+def test_buffered_faker_follows_shared_draws():
+    def build_interleaved():
+        factory.random.reseed_random("interleaved")
+        values = []
+        for _ in range(6):
+            values.append(BufferedFakerFactory()["word"])
+            values.append(factory.Faker("word").evaluate(None, None, {"locale": None}))
+        return values
+
+    assert build_interleaved() == build_interleaved()
+
+
+def test_buffered_faker_seed():
+    first = wagtail_factories.BufferedFaker("pyint", buffer_size=3, seed=1)
+    second = wagtail_factories.BufferedFaker("pyint", buffer_size=3, seed=1)
+
+    assert [first.evaluate(None, None, {"locale": None}) for _ in range(5)] == [
+        second.evaluate(None, None, {"locale": None}) for _ in range(5)
+    ]
+
+
+def test_buffered_faker_keeps_faker_instance():
+    declaration = wagtail_factories.BufferedFaker("word")
+    declaration.evaluate(None, None, {"locale": None})
+    subfaker = declaration.get_faker(None)
+
+    factory.random.reseed_random("kept")
+    declaration.evaluate(None, None, {"locale": None})
+
+    assert declaration.get_faker(None) is subfaker
+
+
+def test_buffered_faker_throughput():
+    def time_evaluations(declaration):
+        # Leave out creating the Faker instance
+        declaration.evaluate(None, None, {"locale": None})
+        start = time.perf_counter()
+        for _ in range(5000):
+            declaration.evaluate(None, None, {"locale": None})
+        return time.perf_counter() - start
+
+    factory.random.reseed_random("throughput")
+    buffered = min(
+        time_evaluations(wagtail_factories.BufferedFaker("word", buffer_size=256))
+        for _ in range(3)
+    )
+    unbuffered = min(time_evaluations(factory.Faker("word")) for _ in range(3))
+
+    assert buffered < unbuffered
@@ -5,7 +5,10 @@ from wagtail.images.blocks import ImageBlock
 from wagtail.images.models import Image
 
 import wagtail_factories
+from tests.testapp.factories import MyBlockFactory
 from tests.testapp.stream_block_factories import (
+    DeeplyNestedStreamBlockInListBlockFactory,
+    MyStreamBlockFactory,
     PageWithNestedStreamBlockFactory,
     PageWithSimpleStructBlockNestedDeepDefaultsFactory,
     PageWithSimpleStructBlockNestedDefaultsFactory,
@@ -96,6 +99,39 @@ class PageWithStreamBlockTestCase(PageTreeTestCase):
         )
         assert page.body[0].value[0][0].value["title"] == "foo"
 
+    def test_page_with_stream_block_in_list_block_list_of(self):
+        page = PageWithStreamBlockInListBlockFactory(
+            parent=self.root_page,
+            body__0__list_block=wagtail_factories.ListOf(
+                size=2, **{"0__char_block__value": "foo"}
+            ),
+        )
+        assert len(page.body[0].value) == 2
+        assert [stream[0].value for stream in page.body[0].value] == ["foo", "foo"]
+
+    def test_list_of_in_struct_block_in_stream(self):
+        page = PageWithStreamBlockFactory(
+            parent=self.root_page,
+            body__0__struct_block__items=wagtail_factories.ListOf(
+                size=3, label="label"
+            ),
+            body__0__struct_block__image__image=None,
+        )
+        items = page.body[0].value["items"]
+        assert [item["label"] for item in items] == ["label"] * 3
+
+        value = MyStreamBlockFactory.build(
+            **{
+                "0__struct_block__items": wagtail_factories.ListOf(size=2),
+                "0__struct_block__image__image": None,
+            }
+        )
+        assert len(value[0].value["items"]) == 2
+
+    def test_list_block_unknown_declaration(self):
+        with pytest.raises(InvalidDeclaration):
+            MyBlockFactory(items__label="label", image__image=None)
+
     def test_computed_values_on_struct_block_in_nested_stream(self):
         page = PageWithSimpleStructBlockNestedFactory(
             body__0__inner_stream__0="simple_struct_block"
@@ -163,6 +199,67 @@ class PageWithStreamBlockTestCase(PageTreeTestCase):
         assert page.body[0].value is None
 
 
+class StreamSpecTestCase(PageTreeTestCase):
+    def test_page_with_stream_spec(self):
+        page = PageWithStreamBlockFactory(
+            parent=self.root_page,
+            body__blocks=[
+                ("char_block", {"value": "foo"}),
+                "struct_block",
+                ("struct_block", {"title": "bar", "image__image": None}),
+            ],
+        )
+        assert [child.block_type for child in page.body] == [
+            "char_block",
+            "struct_block",
+            "struct_block",
+        ]
+        assert page.body[0].value == "foo"
+        assert page.body[1].value["title"] == "lazy function foobar"
+        assert page.body[2].value["title"] == "bar"
+        assert page.body[2].value["image"] is None
+
+    def test_stream_block_factory_with_spec(self):
+        value = MyStreamBlockFactory(blocks=["char_block", "char_block"])
+        assert isinstance(value, blocks.StreamValue)
+        assert [child.block_type for child in value] == ["char_block", "char_block"]
+
+    def test_nested_stream_spec(self):
+        page = PageWithNestedStreamBlockFactory(
+            parent=self.root_page,
+            body__blocks=[
+                ("inner_stream", {"blocks": [("char_block", {"value": "a"})]})
+            ],
+        )
+        assert page.body[0].value[0].value == "a"
+
+    def test_stream_spec_combined_with_indexed_declarations(self):
+        page = PageWithStreamBlockFactory(
+            parent=self.root_page,
+            body__blocks=["struct_block"],
+            body__0__struct_block__title="foo",
+            body__1__char_block__value="bar",
+        )
+        assert page.body[0].value["title"] == "foo"
+        assert page.body[1].value == "bar"
+
+    def test_stream_spec_errors(self):
+        with pytest.raises(
+            UnknownChildBlockFactory, match="No factory defined for block 'foobar'"
+        ):
+            PageWithStreamBlockFactory(body__blocks=["foobar"])
+        with pytest.raises(
+            DuplicateDeclaration, match="got char_block, already have struct_block"
+        ):
+            PageWithStreamBlockFactory(
+                body__blocks=["struct_block"], body__0__char_block__value="foo"
+            )
+        with pytest.raises(InvalidDeclaration, match="missing required index 1"):
+            PageWithStreamBlockFactory(
+                body__blocks=["struct_block"], body__2="char_block"
+            )
+
+
 class EmptyStreamValueTestCase(PageTreeTestCase):
     # We should be able to generate a value for a StreamBlockFactory that received no parameters
     # (i.e. the empty StreamValue)
@@ -217,3 +314,141 @@ class StreamFieldFactoryErrorsTestCase(PageTreeTestCase):
             UnknownChildBlockFactory, match="No factory defined for block 'foobar'"
         ):
             PageWithStreamBlockFactory(body__0="foobar")
+
+
+class StreamTemplateTestCase(TestCase):
+    def setUp(self):
+        self.template = wagtail_factories.StreamTemplate(
+            MyStreamBlockFactory,
+            **{
+                "0__struct_block__title": "template title",
+                "0__struct_block__image__image": None,
+                "0__struct_block__items__0__label": "item label",
+                "1__char_block__value": "template text",
+            },
+        )
+
+    def test_instantiate_substitutes_leaves(self):
+        value = self.template.instantiate(
+            **{
+                "0__struct_block__items__0__label": "new label",
+                "1__char_block": "new text",
+            }
+        )
+        assert isinstance(value, blocks.StreamValue)
+        assert value[0].value["title"] == "template title"
+        assert value[0].value["items"][0]["label"] == "new label"
+        assert value[1].value == "new text"
+
+    def test_instantiate_shares_unchanged_subtrees(self):
+        first, second = self.template.instantiate_batch(
+            [{"1__char_block": "first"}, {"1__char_block": "second"}]
+        )
+        assert first.raw_data[0] is second.raw_data[0]
+        assert first[1].value == "first"
+        assert second[1].value == "second"
+        # The template itself is left untouched
+        assert self.template.raw_data[1]["value"] == "template text"
+
+    def test_instantiate_leaf_params(self):
+        value = self.template.instantiate(
+            **{
+                "0__struct_block__image__image": None,
+                "1__char_block__value": "new text",
+            }
+        )
+        assert value[0].value["image"] is None
+        assert value[1].value == "new text"
+
+    def test_instantiate_invalid_path(self):
+        test_values = (
+            ({"2__char_block": "foo"}, "Index 2 is not present"),
+            ({"1__struct_block__title": "foo"}, "must name its block type"),
+            ({"0__struct_block__unknown": "foo"}, "Cannot substitute unknown"),
+            ({"1__char_block__label": "foo"}, "Cannot substitute label"),
+            (
+                {"0__struct_block__image__image__title": "foo"},
+                "Cannot substitute image__title",
+            ),
+        )
+        for overrides, msg in test_values:
+            with self.subTest(overrides=overrides):
+                with pytest.raises(InvalidDeclaration, match=msg):
+                    self.template.instantiate(**overrides)
+
+
+class SeededStreamBlockFactory(DeeplyNestedStreamBlockInListBlockFactory):
+    class Meta:
+        block_id_seed = "seed"
+
+
+class BlockIdsTestCase(PageTreeTestCase):
+    def get_ids(self, value):
+        ids = []
+        for child in value:
+            ids.append(child.id)
+            for item in child.value.bound_blocks:
+                ids.append(item.id)
+                ids.extend(inner.id for inner in item.value)
+        return ids
+
+    def build_value(self, factory_class):
+        return factory_class.build(
+            **{
+                "0__list_block__0__0": "char_block",
+                "0__list_block__0__1": "char_block",
+                "0__list_block__1__0": "char_block",
+                "1__list_block__0__0": "char_block",
+            }
+        )
+
+    def test_seeded_block_ids_are_reproducible(self):
+        ids = self.get_ids(self.build_value(SeededStreamBlockFactory))
+        assert len(ids) == 9
+        assert len(set(ids)) == 9
+        assert ids == self.get_ids(self.build_value(SeededStreamBlockFactory))
+
+    def test_seeded_block_ids_differ_between_seeds(self):
+        with wagtail_factories.block_ids("other seed"):
+            ids = self.get_ids(
+                self.build_value(DeeplyNestedStreamBlockInListBlockFactory)
+            )
+        assert ids != self.get_ids(self.build_value(SeededStreamBlockFactory))
+
+    def test_block_ids_context(self):
+        pages = []
+        for slug in ["first", "second"]:
+            with wagtail_factories.block_ids(1):
+                pages.append(
+                    PageWithStreamBlockFactory(
+                        parent=self.root_page,
+                        slug=slug,
+                        body__blocks=["char_block"] * 3,
+                    )
+                )
+        first, second = (page.body.get_prep_value() for page in pages)
+        assert [item["id"] for item in first] == [item["id"] for item in second]
+
+    def test_seeded_block_ids_follow_block_paths(self):
+        value = self.build_value(SeededStreamBlockFactory)
+        # Another list item in the first block leaves the second block's IDs alone
+        grown = SeededStreamBlockFactory.build(
+            **{
+                "0__list_block__0__0": "char_block",
+                "0__list_block__0__1": "char_block",
+                "0__list_block__1__0": "char_block",
+                "0__list_block__2__0": "char_block",
+                "1__list_block__0__0": "char_block",
+            }
+        )
+        assert self.get_ids(grown)[:6] == self.get_ids(value)[:6]
+        assert self.get_ids(grown)[-3:] == self.get_ids(value)[-3:]
+
+    def test_unseeded_block_ids_are_random(self):
+        first = self.get_ids(
+            self.build_value(DeeplyNestedStreamBlockInListBlockFactory)
+        )
+        second = self.get_ids(
+            self.build_value(DeeplyNestedStreamBlockInListBlockFactory)
+        )
+        assert not set(filter(None, first)) & set(filter(None, second))
@@ -0,0 +1,85 @@
+import pytest
+from wagtail.models import Locale, Page
+
+import wagtail_factories
+from tests.testapp.factories import MyTestPageFactory
+from tests.testapp.models import MyTestPage
+
+
+@pytest.fixture
+def tree():
+    root = Page.get_first_root_node()
+    home = wagtail_factories.PageFactory(parent=root, title="Site home")
+    section = MyTestPageFactory(parent=home, title="Section")
+    MyTestPageFactory(parent=section, title="Article")
+    wagtail_factories.PageFactory(parent=home, title="About")
+    return home
+
+
+@pytest.mark.django_db
+def test_translate_tree(tree):
+    translations = wagtail_factories.PageFactory.create_translations(tree, ["fr", "de"])
+
+    assert list(translations) == ["fr", "de"]
+    root = Page.get_first_root_node()
+    for language_code, pages in translations.items():
+        locale = Locale.objects.get(language_code=language_code)
+        home = tree.get_translation(locale)
+        assert home.slug == f"site-home-{language_code}"
+        assert home.get_parent() == root
+        assert home.live
+
+        translated_tree = list(home.get_descendants(inclusive=True).specific())
+        assert [p.pk for p in translated_tree] == [p.pk for p in pages]
+        source_tree = list(tree.get_descendants(inclusive=True))
+        assert [p.title for p in translated_tree] == [p.title for p in source_tree]
+        assert [p.translation_key for p in translated_tree] == [
+            p.translation_key for p in source_tree
+        ]
+        assert all(p.locale == locale for p in translated_tree)
+
+        article = translated_tree[2]
+        assert isinstance(article, MyTestPage)
+        assert article.url_path == f"/site-home-{language_code}/section/article/"
+        assert article.get_parent().specific == translated_tree[1]
+
+    assert Page.find_problems() == ([], [], [], [], [])
+
+
+@pytest.mark.django_db
+def test_translate_subtree(tree):
+    wagtail_factories.PageFactory.create_translations(tree, ["fr"])
+    section = tree.get_children().get(title="Section").specific
+    # Translating a subtree again, under the already translated home page
+    section_page = MyTestPageFactory(parent=section, title="New article")
+    (fr_page,) = wagtail_factories.PageFactory.create_translations(
+        section_page, ["fr"]
+    )["fr"]
+
+    assert fr_page.get_parent().specific == section.get_translation(
+        Locale.objects.get(language_code="fr")
+    )
+    assert Page.find_problems() == ([], [], [], [], [])
+
+
+@pytest.mark.django_db
+def test_translate_tree_as_drafts(tree):
+    translations = wagtail_factories.PageFactory.create_translations(
+        tree, ["fr"], keep_live=False
+    )
+    assert not any(page.live for page in translations["fr"])
+
+
+@pytest.mark.django_db
+def test_translate_subtree_slug_taken(tree):
+    wagtail_factories.PageFactory.create_translations(tree, ["fr"])
+    section = tree.get_children().get(title="Section").specific
+    fr_section = section.get_translation(Locale.objects.get(language_code="fr"))
+    wagtail_factories.PageFactory(parent=fr_section, title="Taken", slug="news")
+    news = MyTestPageFactory(parent=section, title="News", slug="news")
+
+    (fr_news,) = wagtail_factories.PageFactory.create_translations(news, ["fr"])["fr"]
+
+    assert fr_news.slug == "news-1"
+    assert fr_news.url_path == f"{fr_section.url_path}news-1/"
+    assert Page.find_problems() == ([], [], [], [], [])
@@ -0,0 +1,93 @@
+import factory
+import pytest
+from wagtail.models import Collection, Page
+
+import wagtail_factories
+
+
+class TreePageFactory(wagtail_factories.PageFactory):
+    title = factory.Sequence(lambda n: f"Page {n}")
+
+    class Meta:
+        build_tree = True
+
+
+def test_build_tree_without_database():
+    # No django_db mark, so any query would fail the test
+    root = TreePageFactory.build(parent=None, slug="root")
+    section = TreePageFactory.build(parent=root, slug="section")
+    pages = TreePageFactory.build_batch(2, parent=section)
+
+    assert (root.path, root.depth, root.url_path) == ("0001", 1, "/")
+    assert (section.path, section.depth, section.url_path) == (
+        "00010001",
+        2,
+        "/section/",
+    )
+    assert [page.path for page in pages] == ["000100010001", "000100010002"]
+    assert [page.depth for page in pages] == [3, 3]
+    assert pages[0].url_path == f"/section/{pages[0].slug}/"
+
+    assert section.numchild == 2
+    assert wagtail_factories.get_built_children(root) == [section]
+    assert wagtail_factories.get_built_children(section) == pages
+    assert pages[1].get_parent() is section
+    assert section.get_parent() is root
+
+
+def test_build_tree_nested_parents():
+    page = TreePageFactory.build(
+        slug="child",
+        parent__slug="parent",
+        parent__parent__slug="root",
+        parent__parent__parent=None,
+    )
+    assert page.path == "000100010001"
+    assert page.url_path == "/parent/child/"
+    assert page.get_parent().slug == "parent"
+    assert page.get_parent().get_parent().slug == "root"
+
+
+@pytest.mark.django_db
+def test_build_tree_under_saved_parent():
+    root = Page.get_first_root_node()
+    existing_children = root.numchild
+
+    page = TreePageFactory.build(parent=root, slug="built")
+    second = TreePageFactory.build(parent=root, slug="second")
+    assert page.depth == 2
+    assert page.path == Page._get_path(root.path, 2, existing_children + 1)
+    assert second.path == Page._get_path(root.path, 2, existing_children + 2)
+    assert page.url_path == "/built/"
+    assert page.pk is None
+    # The saved parent's numchild still matches the database
+    assert root.numchild == existing_children
+
+
+def test_build_without_tree():
+    root = wagtail_factories.PageFactory.build(parent=None)
+    page = wagtail_factories.PageFactory.build(parent=root)
+    assert page.path == ""
+    assert root.numchild == 0
+
+
+@pytest.mark.django_db
+def test_create_collection_tree(django_assert_max_num_queries):
+    root = Collection.get_first_root_node()
+    existing = wagtail_factories.CollectionFactory(parent=root)
+
+    with django_assert_max_num_queries(6):
+        collections = wagtail_factories.CollectionFactory.create_tree(
+            root, [2, 3], name="Tree collection"
+        )
+
+    assert len(collections) == 8
+    assert Collection.objects.filter(name="Tree collection").count() == 8
+    assert Collection.find_problems() == ([], [], [], [], [])
+    root.refresh_from_db()
+    assert root.numchild == 3
+    first, second = collections[0], collections[4]
+    assert first.path == Collection._get_path(root.path, 2, 2)
+    assert second.get_prev_sibling() == first
+    assert [c.pk for c in first.get_children()] == [c.pk for c in collections[1:4]]
+    assert existing.get_next_sibling() == first
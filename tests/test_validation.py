@@ -0,0 +1,93 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import django
+import pytest
+
+import wagtail_factories
+from tests.testapp.stream_block_factories import SimpleStructBlockOuterStreamFactory
+
+
+def build_values(texts):
+    return [
+        SimpleStructBlockOuterStreamFactory.build(
+            blocks=[
+                (
+                    "inner_stream",
+                    {"blocks": [("simple_struct_block", {"text": text})]},
+                )
+            ]
+        )
+        for text in texts
+    ]
+
+
+def test_validate_stream_values():
+    report = wagtail_factories.validate_stream_values(
+        build_values(["foo", "", "bar", ""]), chunk_size=3
+    )
+
+    assert report.total == 4
+    assert not report.is_valid
+    assert sorted(report.errors) == [1, 3]
+    assert report.errors[1] == {"0.0.text": ["This field is required."]}
+    assert report.location_counts == {"0.0.text": 2}
+    assert report.duration >= 0
+
+
+def test_validate_stream_values_thread_pool():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        report = wagtail_factories.validate_stream_values(
+            build_values(["foo", "", "bar", ""]), executor=executor, chunk_size=1
+        )
+
+    assert sorted(report.errors) == [1, 3]
+    assert report.location_counts == {"0.0.text": 2}
+
+
+def test_validate_stream_values_process_pool():
+    with ProcessPoolExecutor(
+        max_workers=2,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=django.setup,
+    ) as executor:
+        report = wagtail_factories.validate_stream_values(
+            build_values(["foo", "", "bar", ""]),
+            block_def="testapp.PageWithSimpleStructBlockNested.body",
+            executor=executor,
+            chunk_size=2,
+        )
+
+    assert sorted(report.errors) == [1, 3]
+    assert report.location_counts == {"0.0.text": 2}
+
+
+def test_validate_stream_values_process_pool_requires_reference():
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(TypeError):
+            wagtail_factories.validate_stream_values(
+                build_values(["foo"]), executor=executor
+            )
+
+
+def test_validate_stream_values_field_reference():
+    report = wagtail_factories.validate_stream_values(
+        [[("inner_stream", [("simple_struct_block", {"text": ""})])]],
+        block_def="testapp.PageWithSimpleStructBlockNested.body",
+    )
+
+    assert report.location_counts == {"0.0.text": 1}
+
+
+def test_validate_stream_values_valid():
+    report = wagtail_factories.validate_stream_values(build_values(["a", "b", "c"]))
+
+    assert report.is_valid
+    assert report.total == 3
+    assert "0/3 invalid" in repr(report)
+
+
+def test_validate_stream_values_empty():
+    report = wagtail_factories.validate_stream_values([])
+    assert report.is_valid
+    assert report.total == 0